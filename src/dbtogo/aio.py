@@ -0,0 +1,27 @@
+import asyncio
+from collections.abc import Callable
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+from typing import Any
+
+from dbtogo.datatypes import AsyncDBEngine, DBEngine
+
+
+class ThreadedAsyncEngine(AsyncDBEngine):
+    def __init__(self, engine: DBEngine, executor: Executor | None = None):
+        self._engine = engine
+
+        if executor is None:
+            executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dbtogo")
+        self._executor = executor
+
+    @property
+    def engine(self) -> DBEngine:
+        return self._engine
+
+    async def run[R](self, fn: Callable[..., R], *args: Any, **kwargs: Any) -> R:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(fn, *args, **kwargs))
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
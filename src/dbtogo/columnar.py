@@ -0,0 +1,48 @@
+import importlib
+from array import array
+from collections.abc import Callable, Sequence
+from typing import Any
+
+try:
+    numpy: Any = importlib.import_module("numpy")
+except ImportError:
+    numpy = None
+
+ARRAY_TYPECODES = {"integer": "q", "number": "d", "boolean": "b"}
+NUMPY_DTYPES = {"integer": "int64", "number": "float64", "boolean": "bool"}
+
+
+def build_column(
+    datatype: str,
+    values: Sequence[Any],
+    decoder: Callable[[Any], Any] | None = None,
+) -> Any:
+    if decoder is not None:
+        return [value if value is None else decoder(value) for value in values]
+
+    if datatype not in ARRAY_TYPECODES or None in values:
+        return list(values)
+
+    if numpy is not None:
+        return numpy.array(values, dtype=NUMPY_DTYPES[datatype])
+
+    return array(ARRAY_TYPECODES[datatype], values)
+
+
+def build_columns(
+    names: Sequence[str],
+    datatypes: Sequence[str],
+    rows: list[tuple[Any, ...]],
+    decoders: Sequence[Callable[[Any], Any] | None],
+) -> dict[str, Any]:
+    if len(rows) > 0:
+        values: list[Sequence[Any]] = list(zip(*rows, strict=True))
+    else:
+        values = [()] * len(names)
+
+    return {
+        name: build_column(datatype, column, decoder)
+        for name, datatype, column, decoder in zip(
+            names, datatypes, values, decoders, strict=True
+        )
+    }
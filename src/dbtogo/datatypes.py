@@ -1,8 +1,11 @@
 import abc
+from collections.abc import Callable, Hashable, Iterator
+from contextlib import AbstractContextManager
 from enum import Enum
 from typing import Any
 
 from dbtogo.exceptions import NoBindError
+from dbtogo.instrumentation import QueryListener
 
 
 class SQLType(Enum):
@@ -20,6 +23,18 @@ class SQLConstraint(Enum):
     unique = "unique"
 
 
+class SQLOperator(Enum):
+    eq = "eq"
+    ne = "ne"
+    lt = "lt"
+    le = "le"
+    gt = "gt"
+    ge = "ge"
+    in_ = "in"
+    like = "like"
+    isnull = "isnull"
+
+
 class SQLColumn:
     def __init__(
         self,
@@ -137,6 +152,22 @@ class ChangeDefault(MigrationStep):
         return f"DEFAULT {self.column_name} to {self.new_default}"
 
 
+class AddIndex(MigrationStep):
+    def __init__(self, columns: tuple[str, ...]):
+        self.columns = columns
+
+    def __str__(self) -> str:
+        return f"ADD INDEX on {', '.join(self.columns)}"
+
+
+class DropIndex(MigrationStep):
+    def __init__(self, columns: tuple[str, ...]):
+        self.columns = columns
+
+    def __str__(self) -> str:
+        return f"DROP INDEX on {', '.join(self.columns)}"
+
+
 class Migration:
     def __init__(self, table: str, steps: list[MigrationStep]):
         self.table = table
@@ -165,6 +196,12 @@ class Migration:
         elif type(step) is RenameCol:
             return 5
 
+        elif type(step) is DropIndex:
+            return 6
+
+        elif type(step) is AddIndex:
+            return 7
+
         return 0
 
     def sort(self) -> None:
@@ -178,16 +215,61 @@ class DBEngine(abc.ABC):
     ) -> list[Any]:
         pass
 
+    @abc.abstractmethod
+    def select_iter(
+        self,
+        field: str,
+        table: str,
+        conditions: dict[str, Any] | None = None,
+        chunk_size: int = 1000,
+    ) -> Iterator[Any]:
+        pass
+
+    @abc.abstractmethod
+    def query(
+        self,
+        field: str,
+        table: str,
+        conditions: list[tuple[str, str, Any]] = [],
+        order_by: list[tuple[str, bool]] = [],
+        limit: int | None = None,
+        offset: int | None = None,
+    ) -> list[Any]:
+        pass
+
     @abc.abstractmethod
     def insert(self, table: str, obj_data: dict[str, Any]) -> int | None:
         pass
 
     @abc.abstractmethod
-    def migrate(self, table: str, columns: list[SQLColumn]) -> None:
+    def insert_many(
+        self, table: str, objs_data: list[dict[str, Any]]
+    ) -> list[int | None]:
+        pass
+
+    @abc.abstractmethod
+    def upsert_many(
+        self,
+        table: str,
+        objs_data: list[dict[str, Any]],
+        conflict: tuple[str, ...],
+        primary_key: str,
+    ) -> list[Any]:
+        pass
+
+    @abc.abstractmethod
+    def migrate(
+        self,
+        table: str,
+        columns: list[SQLColumn],
+        indexes: list[tuple[str, ...]] = [],
+    ) -> None:
         pass
 
     @abc.abstractmethod
-    def update(self, table: str, obj_data: dict[str, Any], primary_key: str) -> None:
+    def update(
+        self, table: str, obj_data: dict[str, Any], primary_key: str, key: Any = None
+    ) -> None:
         pass
 
     @abc.abstractmethod
@@ -195,27 +277,214 @@ class DBEngine(abc.ABC):
         pass
 
     @abc.abstractmethod
-    def execute_migration(self, migration: Migration, force: bool = False) -> None:
+    def execute_migration(
+        self,
+        migration: Migration,
+        force: bool = False,
+        chunk_size: int | None = None,
+        progress: Callable[[int, int], None] | None = None,
+    ) -> None:
+        pass
+
+    @abc.abstractmethod
+    def transaction(self) -> AbstractContextManager[None]:
+        pass
+
+    @abc.abstractmethod
+    def on_rollback(
+        self, key: Hashable, snapshot: Callable[[], Callable[[], None]]
+    ) -> None:
+        pass
+
+    @abc.abstractmethod
+    def watch(self, table: str, listener: Callable[[str, list[Any]], None]) -> None:
+        pass
+
+    @abc.abstractmethod
+    def column_codecs(self, table: str) -> dict[str, str]:
+        pass
+
+    @abc.abstractmethod
+    def convert_column(
+        self,
+        table: str,
+        primary_key: str,
+        column: str,
+        codec_format: str,
+        convert: Callable[[bytes], Any] | None,
+    ) -> None:
+        pass
+
+    @abc.abstractmethod
+    def check_coherence(self) -> None:
+        pass
+
+    @abc.abstractmethod
+    def add_listener(self, listener: QueryListener) -> None:
+        pass
+
+    @abc.abstractmethod
+    def remove_listener(self, listener: QueryListener) -> None:
         pass
 
 
+class AsyncDBEngine(abc.ABC):
+    @property
+    @abc.abstractmethod
+    def engine(self) -> DBEngine:
+        pass
+
+    @abc.abstractmethod
+    async def run[R](self, fn: Callable[..., R], *args: Any, **kwargs: Any) -> R:
+        pass
+
+    @abc.abstractmethod
+    def close(self) -> None:
+        pass
+
+    async def select(
+        self, field: str, table: str, conditions: dict[str, Any] | None = None
+    ) -> list[Any]:
+        return await self.run(self.engine.select, field, table, conditions)
+
+    async def query(
+        self,
+        field: str,
+        table: str,
+        conditions: list[tuple[str, str, Any]] = [],
+        order_by: list[tuple[str, bool]] = [],
+        limit: int | None = None,
+        offset: int | None = None,
+    ) -> list[Any]:
+        return await self.run(
+            self.engine.query, field, table, conditions, order_by, limit, offset
+        )
+
+    async def insert(self, table: str, obj_data: dict[str, Any]) -> int | None:
+        return await self.run(self.engine.insert, table, obj_data)
+
+    async def insert_many(
+        self, table: str, objs_data: list[dict[str, Any]]
+    ) -> list[int | None]:
+        return await self.run(self.engine.insert_many, table, objs_data)
+
+    async def upsert_many(
+        self,
+        table: str,
+        objs_data: list[dict[str, Any]],
+        conflict: tuple[str, ...],
+        primary_key: str,
+    ) -> list[Any]:
+        return await self.run(
+            self.engine.upsert_many, table, objs_data, conflict, primary_key
+        )
+
+    async def update(
+        self, table: str, obj_data: dict[str, Any], primary_key: str, key: Any = None
+    ) -> None:
+        return await self.run(self.engine.update, table, obj_data, primary_key, key)
+
+    async def delete(self, table: str, key: str, value: Any) -> None:
+        return await self.run(self.engine.delete, table, key, value)
+
+
 class UnboundEngine(DBEngine):
     def select(
         self, field: str, table: str, conditions: dict[str, Any] | None = None
     ) -> list[Any]:
         raise NoBindError()
 
+    def select_iter(
+        self,
+        field: str,
+        table: str,
+        conditions: dict[str, Any] | None = None,
+        chunk_size: int = 1000,
+    ) -> Iterator[Any]:
+        raise NoBindError()
+
+    def query(
+        self,
+        field: str,
+        table: str,
+        conditions: list[tuple[str, str, Any]] = [],
+        order_by: list[tuple[str, bool]] = [],
+        limit: int | None = None,
+        offset: int | None = None,
+    ) -> list[Any]:
+        raise NoBindError()
+
     def insert(self, table: str, obj_data: dict[str, Any]) -> int | None:
         raise NoBindError()
 
-    def migrate(self, table: str, columns: list[SQLColumn]) -> None:
+    def insert_many(
+        self, table: str, objs_data: list[dict[str, Any]]
+    ) -> list[int | None]:
+        raise NoBindError()
+
+    def upsert_many(
+        self,
+        table: str,
+        objs_data: list[dict[str, Any]],
+        conflict: tuple[str, ...],
+        primary_key: str,
+    ) -> list[Any]:
+        raise NoBindError()
+
+    def migrate(
+        self,
+        table: str,
+        columns: list[SQLColumn],
+        indexes: list[tuple[str, ...]] = [],
+    ) -> None:
         raise NoBindError()
 
-    def update(self, table: str, obj_data: dict[str, Any], primary_key: str) -> None:
+    def update(
+        self, table: str, obj_data: dict[str, Any], primary_key: str, key: Any = None
+    ) -> None:
         raise NoBindError()
 
     def delete(self, table: str, key: str, value: Any) -> None:
         raise NoBindError()
 
-    def execute_migration(self, migration: Migration, force: bool = False) -> None:
+    def execute_migration(
+        self,
+        migration: Migration,
+        force: bool = False,
+        chunk_size: int | None = None,
+        progress: Callable[[int, int], None] | None = None,
+    ) -> None:
+        raise NoBindError()
+
+    def transaction(self) -> AbstractContextManager[None]:
+        raise NoBindError()
+
+    def on_rollback(
+        self, key: Hashable, snapshot: Callable[[], Callable[[], None]]
+    ) -> None:
+        raise NoBindError()
+
+    def watch(self, table: str, listener: Callable[[str, list[Any]], None]) -> None:
+        raise NoBindError()
+
+    def column_codecs(self, table: str) -> dict[str, str]:
+        raise NoBindError()
+
+    def convert_column(
+        self,
+        table: str,
+        primary_key: str,
+        column: str,
+        codec_format: str,
+        convert: Callable[[bytes], Any] | None,
+    ) -> None:
+        raise NoBindError()
+
+    def check_coherence(self) -> None:
+        raise NoBindError()
+
+    def add_listener(self, listener: QueryListener) -> None:
+        raise NoBindError()
+
+    def remove_listener(self, listener: QueryListener) -> None:
         raise NoBindError()
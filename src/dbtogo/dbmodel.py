@@ -1,31 +1,126 @@
 import sqlite3
-from typing import Any, Self
+import threading
+from collections import OrderedDict
+from collections.abc import (
+    AsyncIterator,
+    Callable,
+    Hashable,
+    Iterable,
+    Iterator,
+    MutableMapping,
+)
+from contextlib import AbstractContextManager
+from copy import copy, deepcopy
+from functools import partial
+from itertools import islice
+from typing import Any, Self, overload
+from weakref import WeakValueDictionary
 
 from pydantic import BaseModel
 from pydantic.fields import ModelPrivateAttr
 
-from dbtogo.datatypes import DBEngine, UnboundEngine
-from dbtogo.exceptions import NoBindError, UnboundDeleteError
-from dbtogo.serialization import GeneralSQLSerializer
-from dbtogo.sqlite import SqliteEngine
+from dbtogo.aio import ThreadedAsyncEngine
+from dbtogo.columnar import build_columns
+from dbtogo.datatypes import AsyncDBEngine, DBEngine, SQLOperator, UnboundEngine
+from dbtogo.exceptions import InvalidQueryError, NoBindError, UnboundDeleteError
+from dbtogo.querycache import QueryCache
+from dbtogo.serialization import (
+    GeneralSQLSerializer,
+    PickleCodec,
+    RowCodec,
+    ValueCodec,
+)
+from dbtogo.sqlite import PooledSqliteEngine, SqliteEngine
 
 
 class DBEngineFactory:
     @staticmethod
-    def create_sqlite3_engine(database: str = "") -> DBEngine:
-        conn = sqlite3.connect(database)
-        return SqliteEngine(conn)
+    def create_sqlite3_engine(
+        database: str = "",
+        cached_statements: int = 128,
+        query_cache: QueryCache | None = None,
+    ) -> DBEngine:
+        conn = sqlite3.connect(database, cached_statements=cached_statements)
+        return SqliteEngine(conn, query_cache=query_cache)
+
+    @staticmethod
+    def create_sqlite3_pool_engine(
+        database: str,
+        max_connections: int = 8,
+        timeout: float = 5.0,
+        cached_statements: int = 128,
+        query_cache: QueryCache | None = None,
+    ) -> DBEngine:
+        return PooledSqliteEngine(
+            database,
+            max_connections,
+            timeout,
+            cached_statements,
+            query_cache=query_cache,
+        )
+
+    @staticmethod
+    def create_async_sqlite3_engine(
+        database: str = "",
+        cached_statements: int = 128,
+        query_cache: QueryCache | None = None,
+    ) -> AsyncDBEngine:
+        conn = sqlite3.connect(
+            database, cached_statements=cached_statements, check_same_thread=False
+        )
+        return ThreadedAsyncEngine(SqliteEngine(conn, query_cache=query_cache))
+
+
+type RollbackHook = Callable[[Hashable, Callable[[], Callable[[], None]]], None]
+
+
+def _put[K, V](mapping: MutableMapping[K, V], key: K, value: V | None) -> None:
+    if value is None:
+        mapping.pop(key, None)
+    else:
+        mapping[key] = value
 
 
 class IdentityCache[T: "DBModel", K]:
-    def __init__(self) -> None:
-        self._cache: dict[K, T] = {}
+    def __init__(self, on_rollback: RollbackHook | None = None) -> None:
+        self._cache: MutableMapping[K, T] = {}
         self._soft_keys: dict[K, K] = {}
+        self._on_rollback = on_rollback
+        self._lock = threading.RLock()
 
-    def get(self, key: K) -> T | None:
-        if key is None:
-            return None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = dict(self.__dict__)
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+
+    def _journal(self, *keys: K | None) -> None:
+        if self._on_rollback is None:
+            return
+
+        for key in keys:
+            if key is not None:
+                self._on_rollback((self, key), partial(self._undo, key))
 
+    def _undo(self, key: K) -> Callable[[], None]:
+        value = self._cache.get(key, None)
+        soft_key = self._soft_keys.get(key, None)
+
+        def restore() -> None:
+            with self._lock:
+                _put(self._cache, key, value)
+                _put(self._soft_keys, key, soft_key)
+
+        return restore
+
+    def _lookup(self, key: K) -> T | None:
         hard_result = self._cache.get(key, None)
         if hard_result is not None:
             return hard_result
@@ -35,52 +130,321 @@ class IdentityCache[T: "DBModel", K]:
             return None
 
         ret_val = self._cache.get(hard_key, None)
+        if ret_val is None:
+            self._soft_keys.pop(key)
+
         return ret_val
 
+    def get(self, key: K) -> T | None:
+        if key is None:
+            return None
+
+        with self._lock:
+            ret_val = self._lookup(key)
+            if ret_val is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        return ret_val
+
+    def holds(self, key: K, value: T) -> bool:
+        if key is None:
+            return False
+
+        with self._lock:
+            return self._lookup(key) is value
+
     def set(self, key: K, value: T) -> None:
-        self._cache[key] = value
+        with self._lock:
+            self._journal(key)
+            self._cache[key] = value
 
     def set_soft(self, hard_key: K, soft_key: K) -> None:
-        if hard_key in self._soft_keys.keys():
-            self._soft_keys[soft_key] = self._soft_keys.pop(hard_key)
-            return
-        self._soft_keys[soft_key] = hard_key
+        with self._lock:
+            if hard_key in self._soft_keys.keys():
+                self._soft_keys[soft_key] = self._soft_keys.pop(hard_key)
+                return
+            self._soft_keys[soft_key] = hard_key
 
     def get_hard(self, key: K) -> K:
         return self._soft_keys.get(key, key)
 
+    def harden(self, key: K) -> None:
+        with self._lock:
+            self._journal(key, self._soft_keys.get(key, None))
+
+            hard_key = self._soft_keys.pop(key, None)
+            if hard_key is None:
+                return
+
+            value = self._cache.pop(hard_key, None)
+            if value is not None:
+                self._cache[key] = value
+
     def remove(self, key: K) -> None:
-        hard_key = self.get_hard(key)
-        if hard_key != key:
-            self._soft_keys.pop(key)
+        with self._lock:
+            hard_key = self.get_hard(key)
+            self._journal(key, hard_key)
+
+            if hard_key != key:
+                self._soft_keys.pop(key, None)
+
+            self._cache.pop(hard_key, None)
+
+    def peek(self, key: K) -> T | None:
+        with self._lock:
+            return self._cache.get(key, None)
+
+    def items(self) -> list[tuple[K, T]]:
+        with self._lock:
+            return list(self._cache.items())
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "size": len(self._cache),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
 
-        self._cache.pop(hard_key)
+    def __len__(self) -> int:
+        return len(self._cache)
 
     def __str__(self) -> str:
-        return str(self._cache)
+        return str(dict(self._cache))
+
+
+class WeakIdentityCache[T: "DBModel", K](IdentityCache[T, K]):
+    def __init__(self, max_size: int = 0, on_rollback: RollbackHook | None = None):
+        super().__init__(on_rollback)
+        self._cache = WeakValueDictionary()
+        self._recent: OrderedDict[K, T] = OrderedDict()
+        self.max_size = max_size
+
+    def _touch(self, hard_key: K, value: T) -> None:
+        if self.max_size < 1:
+            return
+
+        self._recent[hard_key] = value
+        self._recent.move_to_end(hard_key)
+
+        while len(self._recent) > self.max_size:
+            self._recent.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, key: K) -> T | None:
+        with self._lock:
+            ret_val = super().get(key)
+            if ret_val is not None:
+                self._touch(self.get_hard(key), ret_val)
+
+        return ret_val
+
+    def set(self, key: K, value: T) -> None:
+        with self._lock:
+            super().set(key, value)
+            self._touch(key, value)
+
+    def harden(self, key: K) -> None:
+        with self._lock:
+            hard_key = self.get_hard(key)
+            super().harden(key)
+
+            value = self._recent.pop(hard_key, None)
+            if value is not None:
+                self._touch(key, value)
+
+    def remove(self, key: K) -> None:
+        with self._lock:
+            self._recent.pop(self.get_hard(key), None)
+            super().remove(key)
+
+    def _undo(self, key: K) -> Callable[[], None]:
+        restore_cache = super()._undo(key)
+        recent = self._recent.get(key, None)
+
+        def restore() -> None:
+            with self._lock:
+                restore_cache()
+                _put(self._recent, key, recent)
+
+        return restore
+
+    def stats(self) -> dict[str, int]:
+        return super().stats() | {"strong": len(self._recent)}
 
 
 class LazyQueryList[T: "DBModel"]:
-    def __init__(self, cls: type[T], objects_data: list[Any]):
+    def __init__(self, cls: type[T], objects_data: list[Any], memoize: bool = True):
         self._objects_data = objects_data
         self._cls = cls
+        self._positions = range(len(objects_data))
+        self._memo: dict[int, T] | None = {} if memoize else None
 
     def __len__(self) -> int:
-        return len(self._objects_data)
+        return len(self._positions)
 
-    def __getitem__(self, position: int) -> T:
-        gss = GeneralSQLSerializer()
+    def _build(self, index: int) -> T:
+        if self._memo is None:
+            return self._cls._load(self._objects_data[index], retain=False)
 
-        current_data = self._objects_data[position]
+        obj = self._memo.get(index, None)
+        if obj is None:
+            obj = self._cls._load(self._objects_data[index], retain=False)
+            self._memo[index] = obj
 
-        new_object_values = gss.partially_deserialize_object(self._cls, current_data)
-        pk_value = new_object_values[self._cls._primary]
+        return obj
 
-        cached_obj = self._cls._cache.get(pk_value)
-        if cached_obj is not None:
-            return cached_obj
+    @overload
+    def __getitem__(self, position: int) -> T: ...
+
+    @overload
+    def __getitem__(self, position: slice) -> "LazyQueryList[T]": ...
+
+    def __getitem__(self, position: int | slice) -> "T | LazyQueryList[T]":
+        if isinstance(position, slice):
+            view = copy(self)
+            view._positions = self._positions[position]
+            return view
 
-        return gss.build_object(self._cls, new_object_values)
+        return self._build(self._positions[position])
+
+    def __iter__(self) -> Iterator[T]:
+        return (self._build(index) for index in self._positions)
+
+
+class Query[T: "DBModel"]:
+    def __init__(self, cls: type[T]):
+        self._cls = cls
+        self._conditions: list[tuple[str, str, Any]] = []
+        self._order_by: list[tuple[str, bool]] = []
+        self._limit: int | None = None
+        self._offset: int | None = None
+        self._result: LazyQueryList[T] | None = None
+
+    def _check_field(self, name: str) -> None:
+        if name not in GeneralSQLSerializer().get_codec(self._cls).columns:
+            raise InvalidQueryError(f"{name} is not a field of {self._cls.__name__}")
+
+    def _clone(self) -> "Query[T]":
+        clone = copy(self)
+        clone._conditions = list(self._conditions)
+        clone._order_by = list(self._order_by)
+        clone._result = None
+        return clone
+
+    def where(self, **kwargs: Any) -> "Query[T]":
+        operators = [x.value for x in SQLOperator]
+        clone = self._clone()
+
+        for lookup, value in kwargs.items():
+            name, _, operator = lookup.rpartition("__")
+            if name == "" or operator not in operators:
+                name, operator = lookup, SQLOperator.eq.value
+
+            self._check_field(name)
+
+            if value is None and operator == SQLOperator.eq.value:
+                operator, value = SQLOperator.isnull.value, True
+
+            if value is None and operator == SQLOperator.ne.value:
+                operator, value = SQLOperator.isnull.value, False
+
+            clone._conditions.append((name, operator, value))
+
+        return clone
+
+    def order_by(self, *fields: str) -> "Query[T]":
+        clone = self._clone()
+
+        for field in fields:
+            name = field.removeprefix("-")
+            self._check_field(name)
+            clone._order_by.append((name, field.startswith("-")))
+
+        return clone
+
+    def limit(self, limit: int) -> "Query[T]":
+        clone = self._clone()
+        clone._limit = limit
+        return clone
+
+    def offset(self, offset: int) -> "Query[T]":
+        clone = self._clone()
+        clone._offset = offset
+        return clone
+
+    def execute(self) -> LazyQueryList[T]:
+        if self._result is not None:
+            return self._result
+
+        if not self._cls._is_bound():
+            raise NoBindError()
+
+        codec = GeneralSQLSerializer().get_codec(self._cls)
+        data = self._cls._db.query(
+            codec.field_list,
+            self._cls._table,
+            self._conditions,
+            self._order_by,
+            self._limit,
+            self._offset,
+        )
+
+        self._result = LazyQueryList(self._cls, data)
+        return self._result
+
+    def columns(self, *names: str) -> dict[str, Any]:
+        if not self._cls._is_bound():
+            raise NoBindError()
+
+        codec = GeneralSQLSerializer().get_codec(self._cls)
+        names = names if len(names) > 0 else codec.columns
+        for name in names:
+            self._check_field(name)
+
+        rows = self._cls._db.query(
+            ", ".join(names),
+            self._cls._table,
+            self._conditions,
+            self._order_by,
+            self._limit,
+            self._offset,
+        )
+
+        return build_columns(
+            names,
+            [codec.datatypes[name] for name in names],
+            rows,
+            [codec.codecs[x].decode if x in codec.codecs else None for x in names],
+        )
+
+    def first(self) -> T | None:
+        result = self.limit(1).execute()
+        return result[0] if len(result) > 0 else None
+
+    def __len__(self) -> int:
+        return len(self.execute())
+
+    @overload
+    def __getitem__(self, position: int) -> T: ...
+
+    @overload
+    def __getitem__(self, position: slice) -> LazyQueryList[T]: ...
+
+    def __getitem__(self, position: int | slice) -> T | LazyQueryList[T]:
+        return self.execute()[position]
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self.execute())
+
+    async def aexecute(self) -> list[T]:
+        return await self._cls._async_db().run(lambda: list(self.execute()))
+
+    async def __aiter__(self) -> AsyncIterator[T]:
+        for obj in await self.aexecute():
+            yield obj
 
 
 class DBModel(BaseModel):
@@ -88,22 +452,49 @@ class DBModel(BaseModel):
     _table: str = "table_not_set"
     _primary: str = "primary_not_set"
     _cache = IdentityCache[Self, Any]()
+    _codec: RowCodec | None = None
+    _dirty: set[str] = set()
+    _persisted: bool = False
+    _encoded: dict[str, int] = {}
+    _row: tuple[Any, ...] | None = None
+    _adb: AsyncDBEngine | None = None
+    _cache_first: bool = False
+    _unique_index: dict[str, dict[Any, Any]] = {}
 
     @classmethod
     def bind(
         cls,
-        db: DBEngine,
+        db: DBEngine | AsyncDBEngine,
         primary_key: str | None = None,
         unique: list[str] = [],
         table: str | None = None,
+        indexes: list[tuple[str, ...]] = [],
+        weak_cache: bool = False,
+        cache_size: int = 0,
+        codecs: dict[str, ValueCodec] = {},
+        cache_first: bool = False,
+        coherent: bool = False,
     ) -> None:
+        cls._adb = None
+
+        if isinstance(db, AsyncDBEngine):
+            cls._adb = db
+            db = db.engine
+
         cls._db = db
-        cls._cache = IdentityCache[Self, Any]()
+
+        if weak_cache:
+            cls._cache = WeakIdentityCache[Self, Any](cache_size, db.on_rollback)
+        else:
+            cls._cache = IdentityCache[Self, Any](db.on_rollback)
+        cls._codec = None
+        cls._cache_first = cache_first
+        cls._unique_index = {name: {} for name in unique} if cache_first else {}
 
         table = table if table is not None else cls.__name__
 
-        columns = GeneralSQLSerializer().serialize_schema(
-            cls.__name__, cls.model_json_schema(), primary_key, unique
+        columns, codec = GeneralSQLSerializer().serialize_model(
+            cls, primary_key, unique, codecs
         )
 
         if primary_key is None:
@@ -113,7 +504,32 @@ class DBModel(BaseModel):
 
         cls._primary = primary_key
         cls._table = table
-        db.migrate(table, columns)
+        cls._codec = codec
+        db.migrate(table, columns, [tuple(index) for index in indexes])
+        cls._convert_codecs()
+
+        if coherent:
+            db.watch(table, cls._on_external_change)
+
+    @classmethod
+    def _convert_codecs(cls) -> None:
+        assert cls._codec is not None
+        if len(cls._codec.codecs) == 0:
+            return
+
+        recorded = cls._db.column_codecs(cls._table)
+        for name, value_codec in cls._codec.codecs.items():
+            if recorded.get(name, None) == value_codec.format:
+                continue
+
+            pickled = recorded.get(name, PickleCodec.format) == PickleCodec.format
+            convert = None
+            if pickled and value_codec.format != PickleCodec.format:
+                convert = value_codec.from_pickle
+
+            cls._db.convert_column(
+                cls._table, cls._primary, name, value_codec.format, convert
+            )
 
     @classmethod
     def _is_bound(cls) -> bool:
@@ -125,39 +541,200 @@ class DBModel(BaseModel):
 
         return True
 
+    @classmethod
+    def _async_db(cls) -> AsyncDBEngine:
+        if not cls._is_bound() or not isinstance(cls._adb, AsyncDBEngine):
+            raise NoBindError()
+
+        return cls._adb
+
+    @classmethod
+    def atomic(cls) -> AbstractContextManager[None]:
+        if not cls._is_bound():
+            raise NoBindError()
+
+        return cls._db.transaction()
+
+    @classmethod
+    def _on_external_change(cls, table: str, keys: list[Any]) -> None:
+        if cls._is_bound() and cls._table == table:
+            cls.refresh_cache(keys)
+
+    @classmethod
+    def refresh_cache(
+        cls, keys: Iterable[Any] | None = None, chunk_size: int = 500
+    ) -> None:
+        if not cls._is_bound():
+            raise NoBindError()
+
+        gss = GeneralSQLSerializer()
+        codec = gss.get_codec(cls)
+        primary = codec.columns.index(cls._primary)
+
+        if keys is None:
+            cached = cls._cache.items()
+        else:
+            peeked = ((key, cls._cache.peek(key)) for key in dict.fromkeys(keys))
+            cached = [(key, obj) for key, obj in peeked if obj is not None]
+
+        keys = [key for key, _ in cached]
+
+        rows: dict[Any, tuple[Any, ...]] = {}
+        for start in range(0, len(keys), chunk_size):
+            chunk = keys[start : start + chunk_size]
+            data = cls._db.query(
+                codec.field_list,
+                cls._table,
+                [(cls._primary, SQLOperator.in_.value, chunk)],
+            )
+            rows.update((row[primary], row) for row in data)
+
+        for key, obj in cached:
+            if key not in rows:
+                cls._cache.remove(key)
+                continue
+
+            values = gss.partially_deserialize_object(cls, rows[key])
+            fresh = cls.model_validate(values)
+
+            for name in cls.model_fields:
+                if name != cls._primary and name not in obj._dirty:
+                    obj.__dict__[name] = fresh.__dict__[name]
+
+            obj._row = rows[key]
+            obj._encoded = {
+                name: value for name, value in obj._encoded.items() if name in obj._dirty
+            }
+
+    @classmethod
+    def cache_stats(cls) -> dict[str, int]:
+        return cls._cache.stats()
+
     @classmethod
     def _deserialize_object(cls, object_data: tuple) -> Self:
         py_object = GeneralSQLSerializer().deserialize_object(cls, object_data)
         return py_object
 
+    @classmethod
+    def _load(cls, object_data: tuple, retain: bool = True) -> Self:
+        gss = GeneralSQLSerializer()
+        codec = gss.get_codec(cls)
+
+        new_object_values = codec.decode(object_data)
+        pk_value = new_object_values[cls._primary]
+
+        cached_obj = cls._cache.get(pk_value)
+        if cached_obj is not None:
+            return cached_obj
+
+        new_obj = gss.build_object(cls, new_object_values)
+        new_obj._persisted = True
+        new_obj._row = object_data
+
+        weak = isinstance(cls._cache, WeakIdentityCache)
+        if not weak and not (retain and cls._cache_first):
+            return new_obj
+
+        cls._cache.set(pk_value, new_obj)
+        new_obj._index_unique()
+        return new_obj
+
+    def _index_unique(self) -> None:
+        cls = self.__class__
+        pk_value = getattr(self, cls._primary)
+
+        for name, index in cls._unique_index.items():
+            try:
+                index[getattr(self, name)] = pk_value
+            except TypeError:
+                continue
+
+    @classmethod
+    def _get_cached(cls, name: str, value: Any) -> Self | None:
+        if name == cls._primary:
+            return cls._cache.get(value)
+
+        index = cls._unique_index.get(name, None)
+        if index is None:
+            return None
+
+        try:
+            key = index.get(value, None)
+        except TypeError:
+            return None
+
+        cached = cls._cache.get(key)
+        if cached is None or name in cached._dirty or getattr(cached, name) != value:
+            index.pop(value, None)
+            return None
+
+        return cached
+
     @classmethod
     def get(cls, **kwargs: dict[str, Any]) -> Self | None:
         if not cls._is_bound():
             raise NoBindError()
 
-        data = cls._db.select("*", cls._table, kwargs)
+        if cls._cache_first and len(kwargs) == 1:
+            cls._db.check_coherence()
+            cached = cls._get_cached(*next(iter(kwargs.items())))
+            if cached is not None:
+                return cached
+
+        codec = GeneralSQLSerializer().get_codec(cls)
+        data = cls._db.select(codec.field_list, cls._table, kwargs)
         if len(data) < 1:
             return None
 
-        gss = GeneralSQLSerializer()
+        return cls._load(data[0])
 
-        new_object_values = gss.partially_deserialize_object(cls, data[0])
-        pk_value = new_object_values[cls._primary]
+    @classmethod
+    def get_many(cls, keys: Iterable[Any], chunk_size: int = 500) -> list[Self | None]:
+        if not cls._is_bound():
+            raise NoBindError()
 
-        cached_obj = cls._cache.get(pk_value)
-        if cached_obj is not None:
-            return cached_obj
+        keys = list(keys)
+        found: dict[Any, Self] = {}
+        missing: dict[Any, None] = {}
+        cls._db.check_coherence()
+
+        for key in keys:
+            if key is None or key in found or key in missing:
+                continue
+
+            cached = cls._cache.get(key)
+            if cached is None:
+                missing[key] = None
+            else:
+                found[key] = cached
 
-        return gss.build_object(cls, new_object_values)
+        codec = GeneralSQLSerializer().get_codec(cls)
+        primary = codec.columns.index(cls._primary)
+        missing_keys = list(missing)
+
+        for start in range(0, len(missing_keys), chunk_size):
+            chunk = missing_keys[start : start + chunk_size]
+            data = cls._db.query(
+                codec.field_list,
+                cls._table,
+                [(cls._primary, SQLOperator.in_.value, chunk)],
+            )
+
+            for row in data:
+                found[row[primary]] = cls._load(row)
+
+        return [found.get(key) for key in keys]
 
     def __del__(self) -> None:
-        pk = self.__class__._primary
-        pk_value = getattr(self, pk)
+        cls = self.__class__
+        if not cls._is_bound():
+            return
 
-        if self._cache.get(pk_value) is None:
+        pk_value = getattr(self, cls._primary, None)
+        if not cls._cache.holds(pk_value, self):
             return
 
-        self.__class__._cache.remove(pk_value)
+        cls._cache.remove(pk_value)
 
     def __setattr__(self, name: str, value: Any) -> None:
         cls = self.__class__
@@ -168,36 +745,223 @@ class DBModel(BaseModel):
 
             cls._cache.set_soft(old_pk_val, value)
 
+        if name in cls.model_fields:
+            self._dirty.add(name)
+
         return super().__setattr__(name, value)
 
+    def _track_dirty(self) -> None:
+        if not self.__class__._is_bound():
+            return
+
+        def snapshot() -> Callable[[], None]:
+            dirty = set(self._dirty)
+            persisted = self._persisted
+            encoded = dict(self._encoded)
+
+            def restore() -> None:
+                self._dirty.update(dirty)
+                self._persisted = persisted
+                self._encoded = encoded
+
+            return restore
+
+        self._db.on_rollback(("dirty", id(self)), snapshot)
+
+    def mark_dirty(self, *fields: str) -> None:
+        self._dirty.update(fields)
+
     def _create(self) -> None:
         obj_data = GeneralSQLSerializer().serialize_object(self)
         insert_bind = self._db.insert(self.__class__._table, obj_data)
+        self._register_created(insert_bind, obj_data)
 
+    def _register_created(
+        self, insert_bind: int | None, obj_data: dict[str, Any]
+    ) -> None:
         pk = self.__class__._primary
 
         if getattr(self, pk) is None:
             setattr(self, pk, insert_bind)
 
         self.__class__._cache.set(getattr(self, pk), self)
+        self._index_unique()
+
+        self._track_dirty()
+        self._dirty.clear()
+        self._persisted = True
+        self._encoded = (
+            GeneralSQLSerializer().get_codec(self.__class__).fingerprint(obj_data)
+        )
 
     def _update(self) -> None:
-        obj_data = GeneralSQLSerializer().serialize_object(self)
-        self._db.update(self.__class__._table, obj_data, self.__class__._primary)
+        cls = self.__class__
+        codec = GeneralSQLSerializer().get_codec(cls)
+
+        current = codec.encode(
+            self.__dict__, codec.mutable_fields(self.__dict__, self._dirty)
+        )
+        mutated = {
+            name
+            for name, value in current.items()
+            if self._mutated(codec.columns.index(name), name, value)
+        }
+
+        if len(self._dirty) == 0 and len(mutated) == 0:
+            return
+
+        obj_data = codec.encode(self.__dict__, self._dirty)
+        obj_data.update((name, current[name]) for name in mutated)
+
+        pk_value = getattr(self, cls._primary)
+        self._db.update(
+            cls._table, obj_data, cls._primary, cls._cache.get_hard(pk_value)
+        )
+
+        cls._cache.harden(pk_value)
+        self._index_unique()
+
+        self._track_dirty()
+        self._dirty.clear()
+        self._encoded.update(codec.fingerprint(obj_data))
+
+    def _mutated(self, position: int, name: str, value: Any) -> bool:
+        if name in self._encoded:
+            return hash(value) != self._encoded[name]
+
+        if self._row is not None:
+            return value != self._row[position]
+
+        return True
 
     def save(self) -> None:
         if not self.__class__._is_bound():
             raise NoBindError()
 
-        pk_value = getattr(self, self.__class__._primary, None)
-        cached = self.__class__._cache.get(pk_value)
-
+        cached = self._claim()
         if cached is None:
             return self._create()
 
-        assert cached is self
+        self._update()
+        if cached is not self:
+            cached._adopt(self)
+
+    def _claim(self) -> Self | None:
+        cls = self.__class__
+        pk_value = getattr(self, cls._primary, None)
+        cached = cls._cache.get(pk_value)
+
+        if cached is None and self._persisted:
+            cls._cache.set(cls._cache.get_hard(pk_value), self)
+            return self
+
+        assert cached is None or cached is self or self._persisted
+        return cached
+
+    @classmethod
+    def save_many(cls, objs: list[Self]) -> None:
+        if not cls._is_bound():
+            raise NoBindError()
+
+        with cls._db.transaction():
+            new_objs = []
+            for obj in objs:
+                cached = obj._claim()
+
+                if cached is None:
+                    new_objs.append(obj)
+                    continue
+
+                obj._update()
+                if cached is not obj:
+                    cached._adopt(obj)
+
+            gss = GeneralSQLSerializer()
+            objs_data = [gss.serialize_object(obj) for obj in new_objs]
+            insert_binds = cls._db.insert_many(cls._table, objs_data)
+
+            for obj, obj_data, insert_bind in zip(
+                new_objs, objs_data, insert_binds, strict=True
+            ):
+                obj._register_created(insert_bind, obj_data)
+
+    def _register_upserted(self, key: Any, obj_data: dict[str, Any]) -> None:
+        cls = self.__class__
+
+        if getattr(self, cls._primary) != key:
+            super().__setattr__(cls._primary, key)
+
+        self._track_dirty()
+        self._dirty.clear()
+        self._persisted = True
+        self._encoded = GeneralSQLSerializer().get_codec(cls).fingerprint(obj_data)
+
+        cached = cls._cache.get(key)
+        if cached is not None and cached is not self:
+            cached._adopt(self)
+            return
+
+        cls._cache.set(key, self)
+        self._index_unique()
+
+    def _adopt(self, written: Self) -> None:
+        def snapshot() -> Callable[[], None]:
+            values = dict(self.__dict__)
+            return lambda: self.__dict__.update(values)
+
+        self._db.on_rollback(("fields", id(self)), snapshot)
+
+        for name in self.__class__.model_fields:
+            self.__dict__[name] = deepcopy(written.__dict__[name])
+
+        self._track_dirty()
+        self._dirty.clear()
+        self._encoded = dict(written._encoded)
+        self._row = written._row
+        self._index_unique()
+
+    def upsert(self, conflict: tuple[str, ...] | None = None) -> None:
+        self.__class__.upsert_many([self], conflict)
+
+    @classmethod
+    def upsert_many(
+        cls,
+        objs: list[Self],
+        conflict: tuple[str, ...] | None = None,
+        batch_size: int = 500,
+    ) -> None:
+        if not cls._is_bound():
+            raise NoBindError()
+
+        codec = GeneralSQLSerializer().get_codec(cls)
+        conflict = tuple(conflict) if conflict is not None else (cls._primary,)
 
-        return self._update()
+        for name in conflict:
+            if name not in codec.columns:
+                raise InvalidQueryError(f"{name} is not a field of {cls.__name__}")
+
+        for start in range(0, len(objs), batch_size):
+            batch = objs[start : start + batch_size]
+
+            with cls._db.transaction():
+                upserted, objs_data = [], []
+                for obj in batch:
+                    pk_value = getattr(obj, cls._primary)
+                    if cls._cache.get_hard(pk_value) != pk_value:
+                        obj._update()
+                        continue
+
+                    obj_data = codec.encode(obj.__dict__)
+                    if pk_value is None:
+                        obj_data.pop(cls._primary)
+
+                    upserted.append(obj)
+                    objs_data.append(obj_data)
+
+                keys = cls._db.upsert_many(cls._table, objs_data, conflict, cls._primary)
+
+                for obj, obj_data, key in zip(upserted, objs_data, keys, strict=True):
+                    obj._register_upserted(key, obj_data)
 
     def delete(self) -> None:
         if not self.__class__._is_bound():
@@ -207,16 +971,76 @@ class DBModel(BaseModel):
         pk_value = getattr(self, pk)
         cached = self._cache.get(pk_value)
 
-        if cached is None:
+        if cached is None and not self._persisted:
             raise UnboundDeleteError()
 
         self._db.delete(self.__class__._table, pk, self._cache.get_hard(pk_value))
         self.__class__._cache.remove(pk_value)
 
+        self._track_dirty()
+        self._persisted = False
+
+    @classmethod
+    def where(cls, **kwargs: Any) -> Query[Self]:
+        if not cls._is_bound():
+            raise NoBindError()
+
+        return Query(cls).where(**kwargs)
+
+    @classmethod
+    def columns(cls, *names: str, where: dict[str, Any] = {}) -> dict[str, Any]:
+        return cls.where(**where).columns(*names)
+
+    @classmethod
+    def all(cls, memoize: bool = True) -> LazyQueryList[Self]:
+        if not cls._is_bound():
+            raise NoBindError()
+
+        codec = GeneralSQLSerializer().get_codec(cls)
+        data = cls._db.select(codec.field_list, cls._table)
+        return LazyQueryList(cls, data, memoize)
+
     @classmethod
-    def all(cls) -> LazyQueryList[Self]:
+    def iter_all(cls, chunk_size: int = 1000) -> Iterator[Self]:
         if not cls._is_bound():
             raise NoBindError()
 
-        data = cls._db.select("*", cls._table)
-        return LazyQueryList(cls, data)
+        codec = GeneralSQLSerializer().get_codec(cls)
+        objects_data = cls._db.select_iter(
+            codec.field_list, cls._table, chunk_size=chunk_size
+        )
+
+        return (cls._load(object_data, retain=False) for object_data in objects_data)
+
+    @classmethod
+    async def aget(cls, **kwargs: Any) -> Self | None:
+        return await cls._async_db().run(cls.get, **kwargs)
+
+    @classmethod
+    async def aget_many(
+        cls, keys: Iterable[Any], chunk_size: int = 500
+    ) -> list[Self | None]:
+        return await cls._async_db().run(cls.get_many, keys, chunk_size)
+
+    async def asave(self) -> None:
+        await self._async_db().run(self.save)
+
+    async def adelete(self) -> None:
+        await self._async_db().run(self.delete)
+
+    @classmethod
+    async def aall(cls) -> list[Self]:
+        return await cls._async_db().run(lambda: list(cls.all()))
+
+    @classmethod
+    async def aiter_all(cls, chunk_size: int = 1000) -> AsyncIterator[Self]:
+        adb = cls._async_db()
+        objects = await adb.run(cls.iter_all, chunk_size)
+
+        while True:
+            chunk = await adb.run(lambda: list(islice(objects, chunk_size)))
+            if len(chunk) == 0:
+                return
+
+            for obj in chunk:
+                yield obj
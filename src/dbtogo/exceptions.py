@@ -19,3 +19,8 @@ class DestructiveMigrationError(Exception):
 class InvalidMigrationError(Exception):
     def __init__(self) -> None:
         super().__init__("This migration is not valid")
+
+
+class InvalidQueryError(Exception):
+    def __init__(self, reason: str) -> None:
+        super().__init__(f"This query is not valid: {reason}")
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import bisect
+import logging
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from dbtogo.datatypes import DBEngine
+    from dbtogo.dbmodel import DBModel
+
+logger = logging.getLogger("dbtogo")
+
+
+class QueryEvent:
+    def __init__(self, operation: str, table: str, sql: str, params: Any):
+        self.operation = operation
+        self.table = table
+        self.sql = sql
+        self.params = params
+        self.rowcount = -1
+        self.elapsed_ns = 0
+        self.error: BaseException | None = None
+
+    def __str__(self) -> str:
+        elapsed_ms = self.elapsed_ns / 1_000_000
+        return f"{self.operation} {self.table} ({elapsed_ms:.3f} ms): {self.sql}"
+
+
+class QueryListener:
+    def before(self, event: QueryEvent) -> None:
+        pass
+
+    def after(self, event: QueryEvent) -> None:
+        pass
+
+
+class QueryCounter(QueryListener):
+    def __init__(self) -> None:
+        self.counts: dict[str, dict[str, int]] = {}
+        self.events: list[QueryEvent] = []
+
+    def after(self, event: QueryEvent) -> None:
+        table_counts = self.counts.setdefault(event.table, {})
+        table_counts[event.operation] = table_counts.get(event.operation, 0) + 1
+        self.events.append(event)
+
+    @property
+    def total(self) -> int:
+        return len(self.events)
+
+    def for_table(self, table: str) -> dict[str, int]:
+        return dict(self.counts.get(table, {}))
+
+    def for_model(self, model: type[DBModel]) -> dict[str, int]:
+        return self.for_table(model._table)
+
+    def reset(self) -> None:
+        self.counts.clear()
+        self.events.clear()
+
+
+class LatencyHistogram(QueryListener):
+    def __init__(
+        self,
+        bounds_ns: list[int] = [
+            10_000,
+            100_000,
+            1_000_000,
+            10_000_000,
+            100_000_000,
+            1_000_000_000,
+        ],
+    ):
+        self.bounds_ns = sorted(bounds_ns)
+        self.buckets = [0] * (len(self.bounds_ns) + 1)
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def after(self, event: QueryEvent) -> None:
+        self.buckets[bisect.bisect_left(self.bounds_ns, event.elapsed_ns)] += 1
+        self.count += 1
+        self.total_ns += event.elapsed_ns
+        self.max_ns = max(self.max_ns, event.elapsed_ns)
+
+    def percentile(self, percent: float) -> int | None:
+        if self.count == 0:
+            return None
+
+        target = self.count * percent / 100
+        seen = 0
+        for position, bucket in enumerate(self.buckets):
+            seen += bucket
+            if seen >= target:
+                if position < len(self.bounds_ns):
+                    return self.bounds_ns[position]
+                return self.max_ns
+
+        return self.max_ns
+
+    def stats(self) -> dict[str, Any]:
+        labels = [f"<={bound}ns" for bound in self.bounds_ns] + ["inf"]
+        return {
+            "count": self.count,
+            "mean_ns": self.total_ns // self.count if self.count > 0 else 0,
+            "max_ns": self.max_ns,
+            "buckets": dict(zip(labels, self.buckets, strict=True)),
+        }
+
+
+class SlowQueryLogger(QueryListener):
+    def __init__(
+        self, threshold_ms: float = 100.0, query_logger: logging.Logger = logger
+    ):
+        self.threshold_ns = int(threshold_ms * 1_000_000)
+        self.logger = query_logger
+        self.slow_queries = 0
+
+    def after(self, event: QueryEvent) -> None:
+        if event.elapsed_ns < self.threshold_ns:
+            return
+
+        self.slow_queries += 1
+        self.logger.warning(
+            "Slow query on %s took %.3f ms (%d rows): %s %r",
+            event.table,
+            event.elapsed_ns / 1_000_000,
+            event.rowcount,
+            event.sql,
+            event.params,
+        )
+
+
+@contextmanager
+def assert_num_queries(
+    engine: DBEngine, expected: int, operations: list[str] | None = None
+) -> Iterator[QueryCounter]:
+    counter = QueryCounter()
+    engine.add_listener(counter)
+
+    try:
+        yield counter
+    finally:
+        engine.remove_listener(counter)
+
+    events = [
+        event
+        for event in counter.events
+        if operations is None or event.operation in operations
+    ]
+
+    if len(events) != expected:
+        issued = "\n".join(str(event) for event in events)
+        raise AssertionError(
+            f"Expected {expected} queries, {len(events)} were issued:\n{issued}"
+        )
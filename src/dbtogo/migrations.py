@@ -3,8 +3,10 @@ from copy import deepcopy
 from dbtogo.datatypes import (
     AddCol,
     AddConstraint,
+    AddIndex,
     ChangeDefault,
     DropCol,
+    DropIndex,
     Migration,
     MigrationStep,
     RemoveConstraint,
@@ -47,9 +49,14 @@ class MigrationEngine:
         return steps
 
     def generate_migration(
-        self, table: str, original: list[SQLColumn], new: list[SQLColumn]
+        self,
+        table: str,
+        original: list[SQLColumn],
+        new: list[SQLColumn],
+        original_indexes: list[tuple[str, ...]] = [],
+        new_indexes: list[tuple[str, ...]] = [],
     ) -> Migration:
-        steps = []
+        steps: list[MigrationStep] = []
 
         current_names = [x.name for x in original]
         matched_cols = [x for x in new if x.name in current_names]
@@ -79,6 +86,14 @@ class MigrationEngine:
         for to_be_dropped in removed:
             steps.append(DropCol(to_be_dropped.name))
 
+        for index in original_indexes:
+            if index not in new_indexes:
+                steps.append(DropIndex(index))
+
+        for index in new_indexes:
+            if index not in original_indexes:
+                steps.append(AddIndex(index))
+
         result = Migration(table, steps)
         result.sort()
 
@@ -91,6 +106,29 @@ class MigrationEngine:
                 mapping[step.old_name] = step.new_name
         return mapping
 
+    def get_migrated_indexes(
+        self,
+        original_indexes: list[tuple[str, ...]],
+        migration: Migration,
+        new_cols: list[SQLColumn],
+    ) -> list[tuple[str, ...]]:
+        renamed = self.get_renamed_mapping(migration)
+        col_names = [x.name for x in new_cols]
+
+        dropped = [x.columns for x in migration.steps if type(x) is DropIndex]
+        added = [x.columns for x in migration.steps if type(x) is AddIndex]
+
+        indexes = []
+        for index in original_indexes:
+            if index in dropped:
+                continue
+
+            renamed_index = tuple(renamed.get(col, col) for col in index)
+            if all(col in col_names for col in renamed_index):
+                indexes.append(renamed_index)
+
+        return indexes + [x for x in added if x not in indexes]
+
     def _execute_step(self, new_cols: dict[str, SQLColumn], step: MigrationStep) -> None:
         if type(step) is AddCol:
             new_cols[step.column.name] = step.column
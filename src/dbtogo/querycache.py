@@ -0,0 +1,113 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any
+
+cache_key = tuple[str, str, tuple[Hashable, ...]]
+
+
+class QueryCache:
+    def __init__(self, max_size: int = 1024, ttl: float | None = None):
+        self.max_size = max_size
+        self.ttl = ttl
+
+        self._entries: OrderedDict[cache_key, tuple[int, float, int, list[Any]]] = (
+            OrderedDict()
+        )
+        self._generations: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+        self.memory = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _measure(self, rows: list[Any]) -> int:
+        size = sys.getsizeof(rows)
+        for row in rows:
+            size += sys.getsizeof(row) + sum(sys.getsizeof(value) for value in row)
+
+        return size
+
+    def _pop(self, key: cache_key) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.memory -= entry[2]
+
+    def generation(self, table: str) -> int:
+        return self._generations.get(table, 0)
+
+    def get(self, table: str, query: str, params: tuple[Any, ...]) -> list[Any] | None:
+        key = (table, query, params)
+
+        with self._lock:
+            entry = self._entries.get(key, None)
+
+            if entry is not None:
+                generation, expires, _, rows = entry
+                if generation == self.generation(table) and expires > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return list(rows)
+
+                self._pop(key)
+
+            self.misses += 1
+            return None
+
+    def set(
+        self,
+        table: str,
+        query: str,
+        params: tuple[Any, ...],
+        rows: list[Any],
+        generation: int,
+    ) -> None:
+        if self.max_size < 1:
+            return
+
+        key = (table, query, params)
+        expires = float("inf") if self.ttl is None else time.monotonic() + self.ttl
+        size = self._measure(rows)
+
+        with self._lock:
+            if generation != self.generation(table):
+                return
+
+            self._pop(key)
+            self._entries[key] = (generation, expires, size, list(rows))
+            self.memory += size
+
+            while len(self._entries) > self.max_size:
+                _, (_, _, evicted_size, _) = self._entries.popitem(last=False)
+                self.memory -= evicted_size
+                self.evictions += 1
+
+    def bump(self, table: str) -> None:
+        with self._lock:
+            self._generations[table] = self.generation(table) + 1
+
+    def clear(self) -> None:
+        with self._lock:
+            for table in self._generations:
+                self._generations[table] += 1
+
+            self._entries.clear()
+            self.memory = 0
+
+    def stats(self) -> dict[str, int | float]:
+        requests = self.hits + self.misses
+
+        return {
+            "size": len(self._entries),
+            "memory": self.memory,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / requests if requests > 0 else 0.0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,7 +1,15 @@
 from __future__ import annotations
 
+import abc
+import io
 import pickle
-from typing import TYPE_CHECKING, Any, TypeVar
+import struct
+import sys
+from collections.abc import Callable
+from types import NoneType, UnionType
+from typing import TYPE_CHECKING, Any, TypeVar, Union, get_args, get_origin
+
+from pydantic import BaseModel, TypeAdapter
 
 from dbtogo.datatypes import SQLColumn
 
@@ -11,8 +19,275 @@ if TYPE_CHECKING:
     from dbtogo.dbmodel import DBModel
 
 
+_LEGACY_CLASSES = {
+    ("builtins", "set"),
+    ("builtins", "frozenset"),
+    ("builtins", "bytearray"),
+    ("builtins", "complex"),
+    ("collections", "OrderedDict"),
+    ("datetime", "date"),
+    ("datetime", "datetime"),
+    ("datetime", "time"),
+    ("datetime", "timedelta"),
+    ("datetime", "timezone"),
+    ("decimal", "Decimal"),
+    ("uuid", "UUID"),
+}
+
+
+class _LegacyUnpickler(pickle.Unpickler):
+    def find_class(self, module: str, name: str) -> Any:
+        if (module, name) in _LEGACY_CLASSES:
+            return super().find_class(module, name)
+
+        found = getattr(sys.modules.get(module, None), name, None)
+        if isinstance(found, type) and issubclass(found, BaseModel):
+            return found
+
+        raise pickle.UnpicklingError(f"Refusing to load {module}.{name}")
+
+
+def _load_legacy(value: bytes) -> Any:
+    return _LegacyUnpickler(io.BytesIO(value)).load()
+
+
+_IMMUTABLE = (str, bytes, tuple, frozenset, int, float, complex, NoneType)
+
+
+class ValueCodec(abc.ABC):
+    format = "custom"
+    mutable = True
+
+    @abc.abstractmethod
+    def encode(self, value: Any) -> Any:
+        pass
+
+    @abc.abstractmethod
+    def decode(self, value: Any) -> Any:
+        pass
+
+    def from_pickle(self, value: bytes) -> Any:
+        return self.encode(_load_legacy(value))
+
+
+class PickleCodec(ValueCodec):
+    format = "pickle"
+
+    def __init__(self, protocol: int = pickle.DEFAULT_PROTOCOL):
+        self.protocol = protocol
+
+    def encode(self, value: Any) -> Any:
+        return pickle.dumps(value, protocol=self.protocol)
+
+    def decode(self, value: Any) -> Any:
+        return pickle.loads(value)
+
+    def from_pickle(self, value: bytes) -> Any:
+        return value
+
+
+class OutOfBandPickleCodec(PickleCodec):
+    _magic = b"DBTOGO5"
+
+    def __init__(self) -> None:
+        super().__init__(5)
+
+    def encode(self, value: Any) -> Any:
+        buffers: list[pickle.PickleBuffer] = []
+        data = pickle.dumps(value, protocol=5, buffer_callback=buffers.append)
+
+        if len(buffers) == 0:
+            return data
+
+        raw_buffers = [buffer.raw() for buffer in buffers]
+        sizes = [len(data)] + [buffer.nbytes for buffer in raw_buffers]
+
+        frame = bytearray(self._magic)
+        frame += struct.pack(f"<I{len(sizes)}Q", len(sizes), *sizes)
+        frame += data
+        for buffer in raw_buffers:
+            frame += buffer
+
+        return bytes(frame)
+
+    def decode(self, value: Any) -> Any:
+        if not value.startswith(self._magic):
+            return pickle.loads(value)
+
+        view = memoryview(value)
+        offset = len(self._magic)
+
+        (count,) = struct.unpack_from("<I", view, offset)
+        offset += 4
+        sizes = struct.unpack_from(f"<{count}Q", view, offset)
+        offset += 8 * count
+
+        parts = []
+        for size in sizes:
+            parts.append(view[offset : offset + size])
+            offset += size
+
+        return pickle.loads(parts[0], buffers=parts[1:])
+
+
+class RawBytesCodec(ValueCodec):
+    format = "raw"
+    mutable = False
+
+    def __init__(self, legacy_pickle: bool = False):
+        self.legacy_pickle = legacy_pickle
+
+    def encode(self, value: Any) -> Any:
+        return bytes(value)
+
+    def decode(self, value: Any) -> Any:
+        return self.from_pickle(value) if self.legacy_pickle else value
+
+    def from_pickle(self, value: bytes) -> Any:
+        if value[:1] != b"\x80":
+            return value
+
+        try:
+            legacy = _load_legacy(value)
+        except Exception:
+            return value
+
+        return legacy if legacy is None or isinstance(legacy, bytes) else value
+
+
+class JsonCodec(ValueCodec):
+    format = "json"
+
+    def __init__(self, annotation: Any):
+        self.adapter: TypeAdapter[Any] = TypeAdapter(annotation)
+
+    def encode(self, value: Any) -> Any:
+        return self.adapter.dump_json(value).decode()
+
+    def decode(self, value: Any) -> Any:
+        if isinstance(value, bytes):
+            return _load_legacy(value)
+
+        return self.adapter.validate_json(value)
+
+
+class ModelCodec(ValueCodec):
+    format = "json"
+
+    def __init__(self, model: type[BaseModel]):
+        self.model = model
+
+    def encode(self, value: Any) -> Any:
+        return value.model_dump_json()
+
+    def decode(self, value: Any) -> Any:
+        if isinstance(value, bytes):
+            return _load_legacy(value)
+
+        return self.model.model_validate_json(value)
+
+
+class CodecRegistry:
+    def __init__(self) -> None:
+        self._codecs: dict[type, Callable[[Any], ValueCodec]] = {}
+
+    def register(self, datatype: type, factory: Callable[[Any], ValueCodec]) -> None:
+        self._codecs[datatype] = factory
+
+    def _strip_optional(self, annotation: Any) -> Any:
+        if get_origin(annotation) not in [Union, UnionType]:
+            return annotation
+
+        args = [arg for arg in get_args(annotation) if arg is not NoneType]
+        return args[0] if len(args) == 1 else annotation
+
+    def resolve(self, annotation: Any) -> ValueCodec:
+        annotation = self._strip_optional(annotation)
+        origin = get_origin(annotation) or annotation
+
+        if isinstance(origin, type):
+            for datatype in origin.__mro__:
+                if datatype in self._codecs:
+                    return self._codecs[datatype](annotation)
+
+            if issubclass(origin, BaseModel):
+                return ModelCodec(origin)
+
+        return PickleCodec()
+
+
+codecs = CodecRegistry()
+codecs.register(bytes, lambda _: RawBytesCodec())
+for json_type in [list, tuple, dict, set, frozenset]:
+    codecs.register(json_type, JsonCodec)
+
+
+class RowCodec:
+    def __init__(
+        self, columns: list[SQLColumn], value_codecs: dict[str, ValueCodec] = {}
+    ):
+        self.columns: tuple[str, ...] = tuple(col.name for col in columns)
+        self.datatypes: dict[str, str] = {col.name: col.datatype for col in columns}
+        self.codecs: dict[str, ValueCodec] = {
+            col.name: value_codecs.get(col.name, PickleCodec())
+            for col in columns
+            if col.datatype == "bytes"
+        }
+        self.encoded: frozenset[str] = frozenset(self.codecs)
+        self.mutable: frozenset[str] = frozenset(
+            name for name, codec in self.codecs.items() if codec.mutable
+        )
+        self.field_list: str = ", ".join(self.columns)
+
+        self._encoders: tuple[tuple[str, Callable[[Any], Any] | None], ...] = tuple(
+            (name, self.codecs[name].encode if name in self.codecs else None)
+            for name in self.columns
+        )
+        self._decoders: tuple[tuple[str, Callable[[Any], Any] | None], ...] = tuple(
+            (name, self.codecs[name].decode if name in self.codecs else None)
+            for name in self.columns
+        )
+
+    def encode(
+        self, values: dict[str, Any], fields: set[str] | None = None
+    ) -> dict[str, Any]:
+        obj_data = {}
+        for name, encoder in self._encoders:
+            if fields is not None and name not in fields:
+                continue
+
+            value = values.get(name, None)
+            if encoder is not None and value is not None:
+                value = encoder(value)
+            obj_data[name] = value
+
+        return obj_data
+
+    def mutable_fields(self, values: dict[str, Any], skip: set[str]) -> set[str]:
+        return {
+            name
+            for name in self.mutable - skip
+            if not isinstance(values.get(name, None), _IMMUTABLE)
+        }
+
+    def fingerprint(self, obj_data: dict[str, Any]) -> dict[str, int]:
+        return {name: hash(obj_data[name]) for name in self.mutable if name in obj_data}
+
+    def decode(self, row: tuple[Any, ...]) -> dict[str, Any]:
+        values = {}
+        for (name, decoder), value in zip(self._decoders, row, strict=True):
+            if decoder is not None and value is not None:
+                value = decoder(value)
+            values[name] = value
+
+        return values
+
+
 class GeneralSQLSerializer:
     def _get_col_type(self, col: dict[str, str]) -> str:
+        if "type" not in col.keys():
+            return "object"
+
         has_format = col["type"] == "string" and "format" in col.keys()
         return col["format"] if has_format else col["type"]
 
@@ -26,14 +301,16 @@ class GeneralSQLSerializer:
             if len(types) > 2:
                 raise TypeError("Field has to have a clear type")
 
-            if types[0]["type"] != "null" and types[1]["type"] != "null":
+            nulls = [x.get("type", None) == "null" for x in types]
+
+            if not nulls[0] and not nulls[1]:
                 raise TypeError("Invalid field type")
 
-            if types[0]["type"] == "null" and types[1]["type"] == "null":
+            if nulls[0] and nulls[1]:
                 raise TypeError("Invalid field type")
 
             nullable = True
-            column = types[0] if types[0]["type"] != "null" else types[1]
+            column = types[0] if not nulls[0] else types[1]
 
         str_type = self._get_col_type(column)
 
@@ -45,10 +322,6 @@ class GeneralSQLSerializer:
             return col
 
         col.datatype = "bytes"
-
-        if col.default is not None:
-            col.default = pickle.dumps(col.default)
-
         return col
 
     def serialize_schema(
@@ -79,34 +352,63 @@ class GeneralSQLSerializer:
 
         return cols
 
-    def serialize_object(self, obj: DBModel, no_bind: bool = False) -> dict[str, Any]:
-        columns = self.serialize_schema(obj.__class__.__name__, obj.model_json_schema())
-        obj_data = {}
-
+    def get_value_codecs(
+        self,
+        cls: type[DBModel],
+        columns: list[SQLColumn],
+        overrides: dict[str, ValueCodec] = {},
+    ) -> dict[str, ValueCodec]:
+        value_codecs = {}
         for col in columns:
             if col.datatype != "bytes":
-                obj_data[col.name] = obj.__dict__.get(col.name, None)
                 continue
 
-            raw_obj = obj.__dict__.get(col.name, None)
-            obj_data[col.name] = pickle.dumps(raw_obj)
+            if col.name in overrides:
+                value_codecs[col.name] = overrides[col.name]
+            else:
+                annotation = cls.model_fields[col.name].annotation
+                value_codecs[col.name] = codecs.resolve(annotation)
 
-        return obj_data
+        return value_codecs
 
-    def partially_deserialize_object(
-        self, cls: type[T], obj_data: tuple[Any]
-    ) -> dict[str, Any]:
-        columns = self.serialize_schema(cls.__name__, cls.model_json_schema())
-        values = {}
+    def serialize_model(
+        self,
+        cls: type[DBModel],
+        primary: str | None = None,
+        unique: list[str] = [],
+        overrides: dict[str, ValueCodec] = {},
+    ) -> tuple[list[SQLColumn], RowCodec]:
+        columns = self.serialize_schema(
+            cls.__name__, cls.model_json_schema(), primary, unique
+        )
+        value_codecs = self.get_value_codecs(cls, columns, overrides)
 
-        for i, col in enumerate(columns):
-            value = obj_data[i]
-            if col.datatype == "bytes":
-                value = pickle.loads(value)
+        for col in columns:
+            if col.name not in value_codecs or col.default is None:
+                continue
 
-            values[col.name] = value
+            default = cls.model_fields[col.name].get_default(call_default_factory=True)
+            col.default = value_codecs[col.name].encode(default)
 
-        return values
+        return columns, RowCodec(columns, value_codecs)
+
+    def compile_codec(self, cls: type[DBModel]) -> RowCodec:
+        return self.serialize_model(cls)[1]
+
+    def get_codec(self, cls: type[DBModel]) -> RowCodec:
+        codec = cls.__dict__.get("_codec", None)
+        if isinstance(codec, RowCodec):
+            return codec
+
+        return self.compile_codec(cls)
+
+    def serialize_object(self, obj: DBModel, no_bind: bool = False) -> dict[str, Any]:
+        return self.get_codec(obj.__class__).encode(obj.__dict__)
+
+    def partially_deserialize_object(
+        self, cls: type[T], obj_data: tuple[Any]
+    ) -> dict[str, Any]:
+        return self.get_codec(cls).decode(obj_data)
 
     def build_object(self, cls: type[T], values: dict[str, Any]) -> T:
         result = cls(**values)
@@ -1,11 +1,38 @@
+import functools
+import hashlib
+import queue
 import sqlite3
-from typing import Any
+import threading
+import time
+import weakref
+from collections.abc import Callable, Hashable, Iterator
+from contextlib import contextmanager
+from copy import copy
+from typing import Any, Concatenate
 
-from dbtogo.datatypes import DBEngine, SQLColumn
+from dbtogo.datatypes import (
+    AddCol,
+    AddIndex,
+    DBEngine,
+    DropIndex,
+    MigrationStep,
+    RenameCol,
+    SQLColumn,
+    SQLOperator,
+)
 from dbtogo.exceptions import DestructiveMigrationError
+from dbtogo.instrumentation import QueryEvent, QueryListener
 from dbtogo.migrations import Migration, MigrationEngine
+from dbtogo.querycache import QueryCache
 
-sqlite_column = tuple[int, str, str, int, Any, int]
+statement_key = tuple[str, str, tuple[Any, ...], str]
+
+WRITTEN = "written"
+MIGRATIONS_TABLE = "_dbtogo_migrations"
+VERSIONS_TABLE = "_dbtogo_versions"
+CHANGELOG_TABLE = "_dbtogo_changelog"
+SCHEMA_TABLE = "_dbtogo_schema"
+CODECS_TABLE = "_dbtogo_codecs"
 
 
 class SQLiteEngineError(Exception):
@@ -13,42 +40,527 @@ class SQLiteEngineError(Exception):
 
 
 class SqliteEngine(DBEngine):
-    def __init__(self, conn: sqlite3.Connection):
-        self.conn = conn
-        self.cursor = conn.cursor()
+    def __init__(
+        self,
+        conn: sqlite3.Connection,
+        statement_cache_size: int = 1024,
+        query_cache: QueryCache | None = None,
+    ):
+        self._conn = conn
+        self._conn_savepoints: list[dict[Hashable, Callable[[], None]]] = []
+
+        self._statements: dict[statement_key, str] = {}
+        self._statement_cache_size = statement_cache_size
+
+        self._schema_cache: dict[str, tuple[list[SQLColumn], list[tuple[str, ...]]]] = {}
+        self._schema_version: int | None = None
+
+        self.query_cache = query_cache
+
+        self._listeners: dict[str, list[Callable[[str, list[Any]], None]]] = {}
+        self._data_versions: dict[sqlite3.Connection, int] = {}
+        self._table_versions: dict[str, int] = {}
+
+        self._query_listeners: list[QueryListener] = []
+
+        self.migration_chunk_size: int | None = None
+        self.migration_progress: Callable[[int, int], None] | None = None
 
     def __del__(self) -> None:
-        self.conn.close()
+        self._conn.close()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        return self._conn
+
+    @property
+    def cursor(self) -> sqlite3.Cursor:
+        return self.conn.cursor()
+
+    @property
+    def _savepoints(self) -> list[dict[Hashable, Callable[[], None]]]:
+        return self._conn_savepoints
+
+    def _commit(self) -> None:
+        if len(self._savepoints) == 0:
+            self.conn.commit()
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        depth = len(self._savepoints)
+        savepoint = f"dbtogo_savepoint_{depth}"
+
+        if depth > 0:
+            self.conn.execute(f"SAVEPOINT {savepoint}")
+        elif not self.conn.in_transaction:
+            self.conn.execute("BEGIN")
+
+        self._savepoints.append({})
+
+        try:
+            yield
+
+            if depth == 0:
+                self.conn.commit()
+
+        except BaseException as e:
+            frame = self._savepoints.pop()
+
+            if depth > 0:
+                self.conn.execute(f"ROLLBACK TO {savepoint}")
+                self.conn.execute(f"RELEASE {savepoint}")
+            else:
+                self.conn.rollback()
+
+            for restore in reversed(frame.values()):
+                restore()
+
+            raise e
+
+        frame = self._savepoints.pop()
+
+        if depth == 0:
+            for key, restore in frame.items():
+                if isinstance(key, tuple) and key[0] == WRITTEN:
+                    restore()
+
+        if depth > 0:
+            self.conn.execute(f"RELEASE {savepoint}")
+
+            parent = self._savepoints[-1]
+            for key, restore in frame.items():
+                parent.setdefault(key, restore)
+
+    def on_rollback(
+        self, key: Hashable, snapshot: Callable[[], Callable[[], None]]
+    ) -> None:
+        if len(self._savepoints) == 0:
+            return
+
+        frame = self._savepoints[-1]
+        if key not in frame:
+            frame[key] = snapshot()
+
+    def add_listener(self, listener: QueryListener) -> None:
+        self._query_listeners.append(listener)
+
+    def remove_listener(self, listener: QueryListener) -> None:
+        self._query_listeners.remove(listener)
+
+    def _execute(
+        self,
+        operation: str,
+        table: str,
+        query: str,
+        params: Any = (),
+        many: bool = False,
+        fetch: bool = False,
+    ) -> Any:
+        run = self.conn.executemany if many else self.conn.execute
+        listeners = list(self._query_listeners)
+
+        if len(listeners) == 0:
+            cursor = run(query, params)
+            return cursor.fetchall() if fetch else cursor
+
+        event = QueryEvent(operation, table, query, params)
+        for listener in listeners:
+            listener.before(event)
+
+        start = time.perf_counter_ns()
+        try:
+            cursor = run(query, params)
+            result: Any = cursor.fetchall() if fetch else cursor
+            event.rowcount = len(result) if fetch else cursor.rowcount
+        except BaseException as error:
+            event.error = error
+            raise
+        finally:
+            event.elapsed_ns = time.perf_counter_ns() - start
+
+            for listener in listeners:
+                listener.after(event)
+
+        return result
+
+    def _written(self, table: str) -> None:
+        cache = self.query_cache
+        if cache is None:
+            return
+
+        cache.bump(table)
+        self.on_rollback((WRITTEN, table), lambda: lambda: cache.bump(table))
+
+    def _install_version_triggers(self, table: str, force: bool = False) -> None:
+        events = ["insert", "update", "delete"]
+        names = tuple(f"_dbtogo_version_{event}_{table}" for event in events)
+
+        installed: dict[str, str] = {}
+        if not force:
+            query = "SELECT name, sql FROM sqlite_master WHERE type = 'trigger' "
+            query += f"AND name IN ({', '.join('?' * len(names))})"
+            installed = dict(self._execute("select", table, query, names, fetch=True))
+
+        current = [CHANGELOG_TABLE in installed.get(name, "") for name in names]
+        if all(current):
+            return
+
+        self._execute(
+            "migrate",
+            VERSIONS_TABLE,
+            f"CREATE TABLE IF NOT EXISTS {VERSIONS_TABLE} "
+            "(table_name TEXT PRIMARY KEY, version INTEGER NOT NULL)",
+        )
+        self._execute(
+            "migrate",
+            VERSIONS_TABLE,
+            f"INSERT OR IGNORE INTO {VERSIONS_TABLE} (table_name, version) "
+            "VALUES (?, 0)",
+            (table,),
+        )
+        self._execute(
+            "migrate",
+            CHANGELOG_TABLE,
+            f"CREATE TABLE IF NOT EXISTS {CHANGELOG_TABLE} (table_name TEXT NOT NULL, "
+            "key, version INTEGER NOT NULL, PRIMARY KEY (table_name, key))",
+        )
+        self._execute(
+            "migrate",
+            CHANGELOG_TABLE,
+            f"CREATE INDEX IF NOT EXISTS ix_{CHANGELOG_TABLE}_version "
+            f"ON {CHANGELOG_TABLE} (table_name, version)",
+        )
+
+        columns, _ = self._introspect(table)
+        primary_key = next(column.name for column in columns if column.primary_key)
+
+        bump = (
+            f"UPDATE {VERSIONS_TABLE} SET version = version + 1 "
+            f"WHERE table_name = '{table}';"
+        )
+        log = (
+            f"INSERT OR REPLACE INTO {CHANGELOG_TABLE} (table_name, key, version) "
+            f"SELECT '{table}', {{}}.{primary_key}, version FROM {VERSIONS_TABLE} "
+            f"WHERE table_name = '{table}';"
+        )
+        triggers = {
+            "insert": log.format("NEW"),
+            "update": log.format("OLD") + " " + log.format("NEW"),
+            "delete": log.format("OLD"),
+        }
+
+        for (event, body), trigger, fresh in zip(
+            triggers.items(), names, current, strict=True
+        ):
+            if not fresh:
+                self._execute("migrate", table, f"DROP TRIGGER IF EXISTS {trigger}")
+            self._execute(
+                "migrate",
+                table,
+                f"CREATE TRIGGER IF NOT EXISTS {trigger} "
+                f"AFTER {event.upper()} ON {table} BEGIN {bump} {body} END",
+            )
+
+        self._commit()
+
+    def watch(self, table: str, listener: Callable[[str, list[Any]], None]) -> None:
+        self._install_version_triggers(table)
+
+        listeners = self._listeners.setdefault(table, [])
+        if listener not in listeners:
+            listeners.append(listener)
+
+        query = f"SELECT version FROM {VERSIONS_TABLE} WHERE table_name = ?"
+        rows = self._execute("select", VERSIONS_TABLE, query, (table,), fetch=True)
+        self._table_versions[table] = rows[0][0]
+
+        if self.conn not in self._data_versions:
+            self._data_versions[self.conn] = self._data_version()
+
+    def _data_version(self) -> int:
+        query = "PRAGMA data_version"
+        version: int = self._execute("select", VERSIONS_TABLE, query, fetch=True)[0][0]
+        return version
+
+    def check_coherence(self) -> None:
+        if len(self._listeners) == 0:
+            return
+
+        version = self._data_version()
+        if self._data_versions.get(self.conn, None) == version:
+            return
+
+        self._data_versions[self.conn] = version
+
+        changed: dict[str, int] = {}
+        query = f"SELECT table_name, version FROM {VERSIONS_TABLE}"
+        for table, table_version in self._execute(
+            "select", VERSIONS_TABLE, query, fetch=True
+        ):
+            if table in self._listeners and self._table_versions[table] != table_version:
+                changed[table] = self._table_versions[table]
+            self._table_versions[table] = table_version
+
+        query = f"SELECT key FROM {CHANGELOG_TABLE} WHERE table_name = ? AND version > ?"
+        for table, seen in changed.items():
+            if self.query_cache is not None:
+                self.query_cache.bump(table)
+
+            params = (table, seen)
+            rows = self._execute("select", CHANGELOG_TABLE, query, params, fetch=True)
+            keys = [row[0] for row in rows]
+            for listener in self._listeners[table]:
+                listener(table, keys)
+
+    def _fetch(
+        self, operation: str, table: str, query: str, params: tuple[Any, ...]
+    ) -> list[Any]:
+        self.check_coherence()
+
+        cache = self.query_cache
+        uncached = (
+            len(self._savepoints) > 0
+            or self.conn.in_transaction
+            or not all(isinstance(x, Hashable) for x in params)
+        )
+
+        if cache is None or uncached:
+            return self._execute(operation, table, query, params, fetch=True)
+
+        rows = cache.get(table, query, params)
+        if rows is not None:
+            return rows
+
+        generation = cache.generation(table)
+        rows = self._execute(operation, table, query, params, fetch=True)
+        cache.set(table, query, params, rows, generation)
+        return rows
 
     def _represent_bytes(self, data: bytes) -> str:
         return f"X'{data.hex().upper()}'"
 
+    def _compile_statement(
+        self, operation: str, table: str, columns: tuple[Any, ...], target: str
+    ) -> str:
+        match operation:
+            case "select":
+                query = f"SELECT {target} FROM {table}"
+                if len(columns) > 0:
+                    query += " WHERE " + " AND ".join(f"{col} = ?" for col in columns)
+                return query
+
+            case "insert":
+                val_str = ", ".join(["?"] * len(columns))
+                return f"INSERT INTO {table} ({', '.join(columns)}) VALUES({val_str})"
+
+            case "update":
+                set_string = ", ".join(f"{col} = ?" for col in columns)
+                return f"UPDATE {table} SET {set_string} WHERE {target} = ?"
+
+            case "delete":
+                return f"DELETE FROM {table} WHERE {target} = ?"
+
+            case "upsert":
+                cols, conflict = columns
+                query = self._compile_statement("insert", table, cols, "")
+
+                updates = [x for x in cols if x not in conflict and x != target]
+                updates = updates if len(updates) > 0 else [conflict[0]]
+
+                set_string = ", ".join(f"{col} = excluded.{col}" for col in updates)
+                query += f" ON CONFLICT ({', '.join(conflict)}) DO UPDATE SET "
+                return query + f"{set_string} RETURNING {target}"
+
+            case "query":
+                return self._compile_query(table, columns, target)
+
+        raise SQLiteEngineError(f"Unknown statement {operation}")
+
+    def _statement(
+        self, operation: str, table: str, columns: tuple[Any, ...], target: str = ""
+    ) -> str:
+        key = (operation, table, columns, target)
+
+        query = self._statements.get(key, None)
+        if query is None:
+            if len(self._statements) >= self._statement_cache_size:
+                self._statements.clear()
+
+            query = self._compile_statement(operation, table, columns, target)
+            self._statements[key] = query
+
+        return query
+
     def select(
         self, field: str, table: str, conditions: dict[str, Any] | None = None
     ) -> list[Any]:
-        if conditions is None:
-            query = f"SELECT {field} FROM {table}"
-            self.cursor.execute(query)
+        conditions = {} if conditions is None else conditions
+        query = self._statement("select", table, tuple(conditions.keys()), field)
 
-        else:
-            where_clause = " AND ".join(f"{key} = ?" for key in conditions.keys())
-            query = f"SELECT {field} FROM {table} WHERE {where_clause}"
-            self.cursor.execute(query, tuple(conditions.values()))
+        return self._fetch("select", table, query, tuple(conditions.values()))
+
+    def select_iter(
+        self,
+        field: str,
+        table: str,
+        conditions: dict[str, Any] | None = None,
+        chunk_size: int = 1000,
+    ) -> Iterator[Any]:
+        conditions = {} if conditions is None else conditions
+        query = self._statement("select", table, tuple(conditions.keys()), field)
+
+        self.check_coherence()
+        cursor = self._execute("select", table, query, tuple(conditions.values()))
+        try:
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if len(rows) == 0:
+                    return
+
+                yield from rows
+
+        finally:
+            cursor.close()
+
+    def _compile_condition(self, column: str, operator: str, value: Any) -> str:
+        comparisons = {
+            SQLOperator.eq.value: "=",
+            SQLOperator.ne.value: "!=",
+            SQLOperator.lt.value: "<",
+            SQLOperator.le.value: "<=",
+            SQLOperator.gt.value: ">",
+            SQLOperator.ge.value: ">=",
+            SQLOperator.like.value: "LIKE",
+        }
+
+        if operator == SQLOperator.isnull.value:
+            return f"{column} IS NULL" if value else f"{column} IS NOT NULL"
+
+        if operator == SQLOperator.in_.value:
+            return f"{column} IN ({', '.join(['?'] * len(value))})"
+
+        return f"{column} {comparisons[operator]} ?"
+
+    def _compile_query(self, table: str, signature: tuple[Any, ...], field: str) -> str:
+        conditions, order_by, has_limit, has_offset = signature
+        query = f"SELECT {field} FROM {table}"
+
+        if len(conditions) > 0:
+            clauses = [self._compile_condition(*condition) for condition in conditions]
+            query += " WHERE " + " AND ".join(clauses)
+
+        if len(order_by) > 0:
+            ordering = [f"{col} {'DESC' if desc else 'ASC'}" for col, desc in order_by]
+            query += " ORDER BY " + ", ".join(ordering)
+
+        if has_limit or has_offset:
+            query += " LIMIT ?"
+
+        if has_offset:
+            query += " OFFSET ?"
 
-        return self.cursor.fetchall()
+        return query
+
+    def query(
+        self,
+        field: str,
+        table: str,
+        conditions: list[tuple[str, str, Any]] = [],
+        order_by: list[tuple[str, bool]] = [],
+        limit: int | None = None,
+        offset: int | None = None,
+    ) -> list[Any]:
+        params: list[Any] = []
+        condition_signature: list[tuple[str, str, Any]] = []
+
+        for column, operator, value in conditions:
+            if operator == SQLOperator.in_.value:
+                condition_signature.append((column, operator, range(len(value))))
+                params.extend(value)
+
+            elif operator == SQLOperator.isnull.value:
+                condition_signature.append((column, operator, bool(value)))
+
+            else:
+                condition_signature.append((column, operator, None))
+                params.append(value)
+
+        if limit is not None or offset is not None:
+            params.append(-1 if limit is None else limit)
+
+        if offset is not None:
+            params.append(offset)
+
+        signature = (
+            tuple(condition_signature),
+            tuple(order_by),
+            limit is not None,
+            offset is not None,
+        )
+        query = self._statement("query", table, signature, field)
+
+        return self._fetch("query", table, query, tuple(params))
 
     def insert(self, table: str, obj_data: dict[str, Any]) -> int | None:
-        cols = [col for col, val in obj_data.items() if val is not None]
-        vals = [val for val in obj_data.values() if val is not None]
+        cols = tuple(col for col, val in obj_data.items() if val is not None)
+        vals = tuple(val for val in obj_data.values() if val is not None)
+
+        query = self._statement("insert", table, cols)
+
+        cursor = self._execute("insert", table, query, vals)
+        self._commit()
+        self._written(table)
+        return cursor.lastrowid
+
+    def insert_many(
+        self, table: str, objs_data: list[dict[str, Any]]
+    ) -> list[int | None]:
+        groups: dict[tuple[str, ...], list[int]] = {}
+        for position, obj_data in enumerate(objs_data):
+            cols = tuple(col for col, val in obj_data.items() if val is not None)
+            groups.setdefault(cols, []).append(position)
+
+        row_ids: list[int | None] = [None] * len(objs_data)
+
+        with self.transaction():
+            for cols, positions in groups.items():
+                query = self._statement("insert", table, cols)
+
+                rows = [tuple(objs_data[i][col] for col in cols) for i in positions]
+                self._execute("insert", table, query, rows, many=True)
+
+                # The write lock is held for the whole transaction, so rows that
+                # rely on autoincrement get consecutive ids ending at the last one
+                last_id = self.conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+                first_id = last_id - len(positions) + 1
 
-        col_str = ", ".join(cols)
-        val_str = ", ".join(["?"] * len(vals))
+                for offset, position in enumerate(positions):
+                    row_ids[position] = first_id + offset
 
-        query = f"INSERT INTO {table} ({col_str}) VALUES({val_str})"
+            self._written(table)
 
-        self.cursor.execute(query, tuple(vals))
-        self.conn.commit()
-        return self.cursor.lastrowid
+        return row_ids
+
+    def upsert_many(
+        self,
+        table: str,
+        objs_data: list[dict[str, Any]],
+        conflict: tuple[str, ...],
+        primary_key: str,
+    ) -> list[Any]:
+        keys = []
+
+        with self.transaction():
+            for obj_data in objs_data:
+                cols = tuple(obj_data.keys())
+                query = self._statement("upsert", table, (cols, conflict), primary_key)
+                keys.append(
+                    self._execute(
+                        "upsert", table, query, tuple(obj_data.values())
+                    ).fetchone()[0]
+                )
+
+        return keys
 
     def _transfer_type_from_standard(self, str_type: str) -> str:
         types = {
@@ -74,99 +586,223 @@ class SqliteEngine(DBEngine):
 
         return types[str_type]
 
-    def _create_table(self, tablename: str, standard_cols: list[SQLColumn]) -> None:
-        sqlite_cols = []
-        for column in standard_cols:
-            lite_col = (
-                f"{column.name} {self._transfer_type_from_standard(column.datatype)}"
-            )
+    def _column_definition(self, column: SQLColumn) -> str:
+        lite_col = f"{column.name} {self._transfer_type_from_standard(column.datatype)}"
 
-            if column.nullable and not column.primary_key:
-                lite_col += " NULLABLE"
-            else:
-                lite_col += " NOT NULL"
+        if column.nullable and not column.primary_key:
+            lite_col += " NULLABLE"
+        else:
+            lite_col += " NOT NULL"
 
-            if column.primary_key:
-                lite_col += " PRIMARY KEY AUTOINCREMENT"
+        if column.primary_key:
+            lite_col += " PRIMARY KEY AUTOINCREMENT"
 
-            if column.unique:
-                lite_col += " UNIQUE"
+        if column.unique:
+            lite_col += " UNIQUE"
 
-            if column.default is not None:
-                if column.datatype == "string":
-                    lite_col += (
-                        f" DEFAULT '{column.default.replace("'", '').replace('"', '')}'"
-                    )
-                elif column.datatype != "bytes":
-                    lite_col += f" DEFAULT {column.default}"
-                else:
-                    lite_col += f" DEFAULT {self._represent_bytes(column.default)}"
+        if column.default is not None:
+            quoted = column.datatype == "string"
+            if column.datatype == "bytes" and isinstance(column.default, str):
+                quoted = not column.default.startswith("X'")
+
+            if isinstance(column.default, bytes):
+                lite_col += f" DEFAULT {self._represent_bytes(column.default)}"
+            elif quoted:
+                lite_col += f" DEFAULT '{column.default.replace("'", "''")}'"
+            else:
+                lite_col += f" DEFAULT {column.default}"
 
-            sqlite_cols.append(lite_col)
+        return lite_col
+
+    def _create_table(self, tablename: str, standard_cols: list[SQLColumn]) -> None:
+        sqlite_cols = [self._column_definition(column) for column in standard_cols]
 
         query = f"CREATE TABLE IF NOT EXISTS {tablename} ({','.join(sqlite_cols)})"
-        self.cursor.execute(query)
+        self._execute("migrate", tablename, query)
 
-        self.conn.commit()
+        self._invalidate_schema(tablename)
+        self._commit()
 
     def _drop_table(self, table: str) -> None:
         query = f"DROP TABLE IF EXISTS {table}"
-        self.cursor.execute(query)
-        self.conn.commit()
+        self._execute("migrate", table, query)
+        self._invalidate_schema(table)
+        self._commit()
 
     def _rename_table(self, old_table: str, new_table: str) -> None:
         query = f"ALTER TABLE {old_table} RENAME TO {new_table}"
-        self.cursor.execute(query)
-        self.conn.commit()
-
-    def _parse_raw_column(self, column: str) -> SQLColumn:
-        column_data: list[str] = column.split(" ")
-        column_name = column_data.pop(0)
-        column_type = self._transfer_type_to_standard(column_data.pop(0))
-
-        nullable = False
-        primary = False
-        default = None
-        unique = False
-
-        while len(column_data) > 0:
-            current = column_data.pop(0)
-            match current:
-                case "NOT":
-                    column_data.pop(0)
-                    nullable = False
-                case "NULLABLE":
-                    nullable = True
-                case "DEFAULT":
-                    default = column_data.pop(0)
-                    if column_type == "string":
-                        default = default.strip("'").strip('"')
-                case "PRIMARY" | "KEY" | "AUTOINCREMENT":
-                    primary = True
-                case "UNIQUE":
-                    unique = True
-                case _:
-                    raise SQLiteEngineError("Failed parsing current DB schema")
-
-        return SQLColumn(column_name, column_type, nullable, default, primary, unique)
+        self._execute("migrate", new_table, query)
+        self._invalidate_schema(old_table)
 
-    def _get_SQLColumns(self, table: str) -> list[SQLColumn]:
-        query = f"SELECT sql FROM sqlite_master WHERE type='table' AND name='{table}';"
-        self.cursor.execute(query)
-        current_schema = self.cursor.fetchone()[0]
-        clean_schema: str = current_schema.split("(")[1].split(")")[0]
-        raw_cols = clean_schema.split(",")
+        if new_table in self._listeners:
+            self._install_version_triggers(new_table, force=True)
+
+        self._commit()
+
+    def _table_exists(self, table: str) -> bool:
+        self._check_schema_version()
+        if table in self._schema_cache:
+            return True
+
+        query = "SELECT name FROM sqlite_master WHERE type='table' AND name=?"
+        return self.conn.execute(query, (table,)).fetchone() is not None
+
+    def _index_name(self, table: str, columns: tuple[str, ...]) -> str:
+        digest = hashlib.sha256(",".join(columns).encode()).hexdigest()[:8]
+        return f"ix_{table}_{'_'.join(columns)}_{digest}"
+
+    def _find_index(self, table: str, columns: tuple[str, ...]) -> str:
+        for _, index, _, origin, _ in self.conn.execute(f"PRAGMA index_list({table})"):
+            if origin != "c" or not index.startswith(f"ix_{table}_"):
+                continue
+
+            index_info = sorted(self.conn.execute(f"PRAGMA index_info({index})"))
+            if tuple(x[2] for x in index_info) == columns:
+                return index
+
+        return self._index_name(table, columns)
+
+    def _create_index(self, table: str, columns: tuple[str, ...]) -> None:
+        index = self._index_name(table, columns)
+        query = f"CREATE INDEX IF NOT EXISTS {index} ON {table} ({', '.join(columns)})"
+        self._execute("migrate", table, query)
+        self._invalidate_schema(table)
+        self._commit()
+
+    def _drop_index(self, table: str, columns: tuple[str, ...]) -> None:
+        query = f"DROP INDEX IF EXISTS {self._find_index(table, columns)}"
+        self._execute("migrate", table, query)
+        self._invalidate_schema(table)
+        self._commit()
+
+    def _parse_default(self, datatype: str, default: str | None) -> Any:
+        if default is None:
+            return None
+
+        if len(default) > 1 and default[0] == default[-1] and default[0] in "'\"":
+            default = default[1:-1].replace(default[0] * 2, default[0])
+
+        try:
+            match datatype:
+                case "integer":
+                    return int(default)
+                case "number":
+                    return float(default)
+                case "boolean":
+                    return default.lower() in ["1", "true"]
+        except ValueError:
+            pass
+
+        return default
+
+    def _check_schema_version(self) -> None:
+        version = self.conn.execute("PRAGMA schema_version").fetchone()[0]
+
+        if version != self._schema_version:
+            self._schema_cache.clear()
+            self._schema_version = version
+
+    def _invalidate_schema(self, table: str) -> None:
+        self._schema_cache.pop(table, None)
+        self._written(table)
+
+    def _introspect(self, table: str) -> tuple[list[SQLColumn], list[tuple[str, ...]]]:
+        self._check_schema_version()
+
+        if table in self._schema_cache:
+            return self._schema_cache[table]
+
+        unique = set()
+        indexes = []
+        for _, index, _, origin, _ in reversed(
+            self.conn.execute(f"PRAGMA index_list({table})").fetchall()
+        ):
+            index_info = sorted(self.conn.execute(f"PRAGMA index_info({index})"))
+            columns = tuple(x[2] for x in index_info)
+
+            if origin == "u" and len(columns) == 1:
+                unique.add(columns[0])
+            elif origin == "c" and index.startswith(f"ix_{table}_"):
+                indexes.append(columns)
 
         standard_cols = []
-        for raw_col in raw_cols:
-            standard_cols.append(self._parse_raw_column(raw_col))
+        for _, name, declared, notnull, default, primary in self.conn.execute(
+            f"PRAGMA table_info({table})"
+        ):
+            column_type = self._transfer_type_to_standard(declared.split(" ")[0])
+            standard_cols.append(
+                SQLColumn(
+                    name,
+                    column_type,
+                    not notnull,
+                    self._parse_default(column_type, default),
+                    primary > 0,
+                    name in unique,
+                )
+            )
 
-        return standard_cols
+        if len(standard_cols) < 1:
+            raise SQLiteEngineError(f"Table {table} does not exist")
+
+        self._schema_cache[table] = (standard_cols, indexes)
+        return standard_cols, indexes
+
+    def _get_indexes(self, table: str) -> list[tuple[str, ...]]:
+        return list(self._introspect(table)[1])
+
+    def _get_SQLColumns(self, table: str) -> list[SQLColumn]:
+        return [copy(x) for x in self._introspect(table)[0]]
+
+    def _is_cheap_step(self, step: MigrationStep) -> bool:
+        if type(step) in [RenameCol, AddIndex, DropIndex]:
+            return True
+
+        if type(step) is AddCol:
+            column = step.column
+            if column.primary_key or column.unique:
+                return False
+
+            return column.nullable or column.default is not None
+
+        return False
+
+    def _alter_table(
+        self,
+        migration: Migration,
+        current_indexes: list[tuple[str, ...]],
+        new_indexes: list[tuple[str, ...]],
+    ) -> None:
+        migration.sort()
+
+        with self.transaction():
+            self._set_fingerprint(migration.table, None)
+
+            for index in current_indexes:
+                if index not in new_indexes:
+                    self._drop_index(migration.table, index)
+
+            for step in migration.steps:
+                if type(step) is AddCol:
+                    column = self._column_definition(step.column)
+                    query = f"ALTER TABLE {migration.table} ADD COLUMN {column}"
+                    self._execute("migrate", migration.table, query)
+
+                elif type(step) is RenameCol:
+                    query = f"ALTER TABLE {migration.table} RENAME COLUMN "
+                    query += f"{step.old_name} TO {step.new_name}"
+                    self._execute("migrate", migration.table, query)
+
+            for index in new_indexes:
+                self._create_index(migration.table, index)
+
+            self._invalidate_schema(migration.table)
 
     def execute_migration(
         self,
         migration: Migration,
         force: bool = False,
+        chunk_size: int | None = None,
+        progress: Callable[[int, int], None] | None = None,
         _current_cols: list[SQLColumn] | None = None,
     ) -> None:
         me = MigrationEngine()
@@ -180,78 +816,516 @@ class SqliteEngine(DBEngine):
         if _current_cols is None:
             _current_cols = self._get_SQLColumns(migration.table)
 
-        new_cols = me.get_migrated_cols(_current_cols, migration)
+        current_indexes = self._get_indexes(migration.table)
 
-        temp_table = f"_temp_migrate_{migration.table}"
-        self._create_table(temp_table, new_cols)
+        new_cols = me.get_migrated_cols(_current_cols, migration)
+        new_indexes = me.get_migrated_indexes(current_indexes, migration, new_cols)
 
-        current = self.select("*", migration.table, None)
-        val_string = ", ".join(["?"] * len(_current_cols))
+        if all(self._is_cheap_step(step) for step in migration.steps):
+            return self._alter_table(migration, current_indexes, new_indexes)
 
         renamed = me.get_renamed_mapping(migration)
         not_dropped = [x.name for x in new_cols]
-        col_str = ", ".join(
-            [
-                renamed.get(x.name, x.name)
-                for x in _current_cols
-                if renamed.get(x.name, x.name) in not_dropped
-            ]
+        copied = [
+            x.name for x in _current_cols if renamed.get(x.name, x.name) in not_dropped
+        ]
+
+        target_str = ", ".join(renamed.get(x, x) for x in copied)
+        source_str = ", ".join(copied)
+
+        temp_table = f"_temp_migrate_{migration.table}"
+
+        if chunk_size is None:
+            chunk_size = self.migration_chunk_size
+        if progress is None:
+            progress = self.migration_progress
+
+        if chunk_size is not None:
+            primary = [x for x in _current_cols if x.primary_key]
+            if len(primary) != 1:
+                raise SQLiteEngineError("Chunked migrations need a primary key")
+
+            return self._copy_online(
+                migration.table,
+                new_cols,
+                new_indexes,
+                (primary[0].name, renamed.get(primary[0].name, primary[0].name)),
+                (source_str, target_str),
+                chunk_size,
+                progress,
+            )
+
+        with self.transaction():
+            self._set_fingerprint(migration.table, None)
+
+            self._drop_table(temp_table)
+            self._create_table(temp_table, new_cols)
+
+            query = f"INSERT INTO {temp_table} ({target_str}) "
+            query += f"SELECT {source_str} FROM {migration.table}"
+            self._execute("migrate", migration.table, query)
+
+            self._drop_table(migration.table)
+            self._rename_table(temp_table, migration.table)
+
+            for index in new_indexes:
+                self._create_index(migration.table, index)
+
+    def _setup_online_copy(
+        self, table: str, primary_key: str, new_cols: list[SQLColumn], log_table: str
+    ) -> tuple[Any, int]:
+        temp_table = f"_temp_migrate_{table}"
+        target = ", ".join(str(x) for x in new_cols)
+
+        self._execute(
+            "migrate",
+            MIGRATIONS_TABLE,
+            f"CREATE TABLE IF NOT EXISTS {MIGRATIONS_TABLE} "
+            "(table_name TEXT PRIMARY KEY, target TEXT NOT NULL, "
+            "last_key, copied INTEGER NOT NULL)",
         )
+        self._commit()
 
-        try:
-            for row in current:
-                query = f"INSERT INTO {temp_table} ({col_str}) VALUES({val_string})"
-                self.cursor.execute(query, row)
+        query = f"SELECT target, last_key, copied FROM {MIGRATIONS_TABLE} "
+        query += "WHERE table_name = ?"
+        rows = self._execute("migrate", MIGRATIONS_TABLE, query, (table,), fetch=True)
+        checkpoint = rows[0] if len(rows) > 0 else None
 
-            self.conn.commit()
+        if (
+            checkpoint is not None
+            and checkpoint[0] == target
+            and self._table_exists(temp_table)
+            and self._table_exists(log_table)
+        ):
+            return checkpoint[1], checkpoint[2]
+
+        with self.transaction():
+            self._set_fingerprint(table, None)
 
-        except Exception as e:
             self._drop_table(temp_table)
-            raise e
+            self._drop_table(log_table)
+            self._create_table(temp_table, new_cols)
+            self._execute(
+                "migrate", log_table, f"CREATE TABLE {log_table} (key PRIMARY KEY)"
+            )
+
+            log = f"INSERT OR IGNORE INTO {log_table} (key) VALUES"
+            triggers = {
+                "insert": f"{log} (NEW.{primary_key});",
+                "update": f"{log} (OLD.{primary_key}); {log} (NEW.{primary_key});",
+                "delete": f"{log} (OLD.{primary_key});",
+            }
+            for event, body in triggers.items():
+                trigger = f"_dbtogo_{event}_{table}"
+                self._execute("migrate", table, f"DROP TRIGGER IF EXISTS {trigger}")
+                self._execute(
+                    "migrate",
+                    table,
+                    f"CREATE TRIGGER {trigger} AFTER {event.upper()} ON {table} "
+                    f"BEGIN {body} END",
+                )
+
+            self._execute(
+                "migrate",
+                MIGRATIONS_TABLE,
+                f"INSERT OR REPLACE INTO {MIGRATIONS_TABLE} "
+                "(table_name, target, last_key, copied) VALUES (?, ?, NULL, 0)",
+                (table, target),
+            )
+
+        return None, 0
+
+    def _copy_online(
+        self,
+        table: str,
+        new_cols: list[SQLColumn],
+        new_indexes: list[tuple[str, ...]],
+        primary_key: tuple[str, str],
+        copied_columns: tuple[str, str],
+        chunk_size: int,
+        progress: Callable[[int, int], None] | None,
+    ) -> None:
+        if chunk_size < 1:
+            raise SQLiteEngineError("Chunk size has to be positive")
+
+        source_pk, target_pk = primary_key
+        source_str, target_str = copied_columns
+
+        temp_table = f"_temp_migrate_{table}"
+        log_table = f"_dbtogo_changes_{table}"
+
+        last_key, copied = self._setup_online_copy(table, source_pk, new_cols, log_table)
+        query = f"SELECT COUNT(*) FROM {table}"
+        total = self._execute("migrate", table, query, fetch=True)[0][0]
+
+        copy_query = f"INSERT INTO {temp_table} ({target_str}) "
+        copy_query += f"SELECT {source_str} FROM {table}"
+
+        while True:
+            with self.transaction():
+                if last_key is None:
+                    query = f"{copy_query} ORDER BY {source_pk} LIMIT ?"
+                    cursor = self._execute("migrate", table, query, (chunk_size,))
+                else:
+                    query = f"{copy_query} WHERE {source_pk} > ? "
+                    query += f"ORDER BY {source_pk} LIMIT ?"
+                    cursor = self._execute(
+                        "migrate", table, query, (last_key, chunk_size)
+                    )
+
+                if cursor.rowcount < 1:
+                    break
+
+                copied += cursor.rowcount
+                query = f"SELECT MAX({target_pk}) FROM {temp_table}"
+                last_key = self._execute("migrate", temp_table, query, fetch=True)[0][0]
 
-        self._drop_table(migration.table)
-        self._rename_table(temp_table, migration.table)
+                self._execute(
+                    "migrate",
+                    MIGRATIONS_TABLE,
+                    f"UPDATE {MIGRATIONS_TABLE} SET last_key = ?, copied = ? "
+                    "WHERE table_name = ?",
+                    (last_key, copied, table),
+                )
 
-    def _migrate_from(self, table: str, new_columns: list[SQLColumn]) -> None:
+            if progress is not None:
+                progress(copied, max(total, copied))
+
+        with self.transaction():
+            changed = f"SELECT key FROM {log_table}"
+            self._execute(
+                "migrate",
+                temp_table,
+                f"DELETE FROM {temp_table} WHERE {target_pk} IN ({changed})",
+            )
+            self._execute(
+                "migrate", table, f"{copy_query} WHERE {source_pk} IN ({changed})"
+            )
+
+            self._drop_table(table)
+            self._rename_table(temp_table, table)
+            self._drop_table(log_table)
+
+            self._execute(
+                "migrate",
+                MIGRATIONS_TABLE,
+                f"DELETE FROM {MIGRATIONS_TABLE} WHERE table_name = ?",
+                (table,),
+            )
+
+            for index in new_indexes:
+                self._create_index(table, index)
+
+    def _fingerprint(
+        self, columns: list[SQLColumn], indexes: list[tuple[str, ...]]
+    ) -> str:
+        schema = [str(column) for column in columns]
+        schema += [", ".join(index) for index in indexes]
+        return hashlib.sha256("\n".join(schema).encode()).hexdigest()
+
+    def _get_fingerprint(self, table: str) -> str | None:
+        if not self._table_exists(SCHEMA_TABLE):
+            return None
+
+        query = f"SELECT fingerprint FROM {SCHEMA_TABLE} WHERE table_name = ?"
+        rows = self._execute("select", SCHEMA_TABLE, query, (table,), fetch=True)
+        return rows[0][0] if len(rows) > 0 else None
+
+    def _set_fingerprint(self, table: str, fingerprint: str | None) -> None:
+        if fingerprint is None:
+            if self._table_exists(SCHEMA_TABLE):
+                query = f"DELETE FROM {SCHEMA_TABLE} WHERE table_name = ?"
+                self._execute("migrate", SCHEMA_TABLE, query, (table,))
+                self._commit()
+            return
+
+        self._execute(
+            "migrate",
+            SCHEMA_TABLE,
+            f"CREATE TABLE IF NOT EXISTS {SCHEMA_TABLE} "
+            "(table_name TEXT PRIMARY KEY, fingerprint TEXT NOT NULL)",
+        )
+        self._execute(
+            "migrate",
+            SCHEMA_TABLE,
+            f"INSERT OR REPLACE INTO {SCHEMA_TABLE} (table_name, fingerprint) "
+            "VALUES (?, ?)",
+            (table, fingerprint),
+        )
+        self._commit()
+
+    def column_codecs(self, table: str) -> dict[str, str]:
+        if not self._table_exists(CODECS_TABLE):
+            return {}
+
+        query = f"SELECT column_name, format FROM {CODECS_TABLE} WHERE table_name = ?"
+        return dict(self._execute("select", CODECS_TABLE, query, (table,), fetch=True))
+
+    def convert_column(
+        self,
+        table: str,
+        primary_key: str,
+        column: str,
+        codec_format: str,
+        convert: Callable[[bytes], Any] | None,
+    ) -> None:
+        chunk_size = self.migration_chunk_size or 1000
+
+        with self.transaction():
+            self._execute(
+                "migrate",
+                CODECS_TABLE,
+                f"CREATE TABLE IF NOT EXISTS {CODECS_TABLE} (table_name TEXT NOT NULL, "
+                "column_name TEXT NOT NULL, format TEXT NOT NULL, "
+                "PRIMARY KEY (table_name, column_name))",
+            )
+
+            last_key = None
+            while convert is not None:
+                query = f"SELECT {primary_key}, {column} FROM {table} "
+                query += f"WHERE typeof({column}) = 'blob' "
+                if last_key is not None:
+                    query += f"AND {primary_key} > ? "
+                query += f"ORDER BY {primary_key} LIMIT ?"
+
+                params = (chunk_size,) if last_key is None else (last_key, chunk_size)
+                rows = self._execute("migrate", table, query, params, fetch=True)
+                if len(rows) == 0:
+                    break
+
+                last_key = rows[-1][0]
+                converted = [(convert(value), key) for key, value in rows]
+                self._execute(
+                    "migrate",
+                    table,
+                    f"UPDATE {table} SET {column} = ? WHERE {primary_key} = ?",
+                    converted,
+                    many=True,
+                )
+                self._written(table)
+
+            self._execute(
+                "migrate",
+                CODECS_TABLE,
+                f"INSERT OR REPLACE INTO {CODECS_TABLE} "
+                "(table_name, column_name, format) VALUES (?, ?, ?)",
+                (table, column, codec_format),
+            )
+
+    def _migrate_from(
+        self,
+        table: str,
+        new_columns: list[SQLColumn],
+        indexes: list[tuple[str, ...]] = [],
+    ) -> None:
         for col in new_columns:
-            if col.datatype == "bytes" and col.default is not None:
+            if isinstance(col.default, bytes):
                 col.default = self._represent_bytes(col.default)
 
         current_columns = self._get_SQLColumns(table)
 
         migration = MigrationEngine().generate_migration(
-            table, current_columns, new_columns
+            table, current_columns, new_columns, self._get_indexes(table), indexes
         )
         if len(migration.steps) > 0:
             self.execute_migration(migration)
 
-    def migrate(self, table: str, columns: list[SQLColumn]) -> None:
-        matched_tables = self.cursor.execute(
-            f"SELECT name FROM sqlite_master WHERE type='table' AND name='{table}';"
-        ).fetchall()
+    def migrate(
+        self,
+        table: str,
+        columns: list[SQLColumn],
+        indexes: list[tuple[str, ...]] = [],
+    ) -> None:
+        fingerprint = self._fingerprint(columns, indexes)
 
-        if len(matched_tables) == 0:
-            return self._create_table(table, columns)
+        if self._table_exists(table):
+            if self._get_fingerprint(table) == fingerprint:
+                return
 
+            self._migrate_from(table, columns, indexes)
         else:
-            return self._migrate_from(table, columns)
+            self._create_table(table, columns)
+            for index in indexes:
+                self._create_index(table, index)
 
-    def update(self, table: str, obj_data: dict[str, Any], primary_key: str) -> None:
-        cols = [col for col, val in obj_data.items() if val is not None]
-        vals = [val for val in obj_data.values() if val is not None]
+        self._set_fingerprint(table, fingerprint)
 
-        set_string = ""
-        for col in cols:
-            set_string += f"{col} = ?, "
-        set_string = set_string[:-2]
+    def update(
+        self, table: str, obj_data: dict[str, Any], primary_key: str, key: Any = None
+    ) -> None:
+        if key is None:
+            key = obj_data[primary_key]
 
-        query = f"UPDATE {table} SET {set_string} WHERE {primary_key} = ?"
-        vals.append(obj_data[primary_key])
+        query = self._statement("update", table, tuple(obj_data.keys()), primary_key)
 
-        self.cursor.execute(query, tuple(vals))
-        self.conn.commit()
+        self._execute("update", table, query, (*obj_data.values(), key))
+        self._commit()
+        self._written(table)
 
     def delete(self, table: str, key: str, value: Any) -> None:
-        query = f"DELETE FROM {table} WHERE {key} = ?"
-        self.cursor.execute(query, (value,))
-        self.conn.commit()
+        query = self._statement("delete", table, (), key)
+        self._execute("delete", table, query, (value,))
+        self._commit()
+        self._written(table)
+
+
+class _ConnectionLease:
+    def __init__(
+        self,
+        conn: sqlite3.Connection,
+        checkin: Callable[[sqlite3.Connection], None],
+    ):
+        self.conn = conn
+        self.savepoints: list[dict[Hashable, Callable[[], None]]] = []
+
+        self.release = weakref.finalize(self, checkin, conn)
+        self.release.atexit = False
+
+
+def _scoped[**P, R](
+    method: Callable[Concatenate[SqliteEngine, P], R],
+) -> Callable[Concatenate["PooledSqliteEngine", P], R]:
+    @functools.wraps(method)
+    def wrapper(engine: "PooledSqliteEngine", *args: P.args, **kwargs: P.kwargs) -> R:
+        with engine._session():
+            return method(engine, *args, **kwargs)
+
+    return wrapper
+
+
+class PooledSqliteEngine(SqliteEngine):
+    def __init__(
+        self,
+        database: str,
+        max_connections: int = 8,
+        timeout: float = 5.0,
+        cached_statements: int = 128,
+        statement_cache_size: int = 1024,
+        query_cache: QueryCache | None = None,
+    ):
+        self._database = database
+        self._max_connections = max_connections
+        self._timeout = timeout
+        self._cached_statements = cached_statements
+
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._idle: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._connections: list[sqlite3.Connection] = []
+
+        if database in ["", ":memory:"]:
+            raise SQLiteEngineError("A pooled engine needs a database file")
+
+        conn = self._checkout()
+        super().__init__(conn, statement_cache_size, query_cache)
+        self._checkin(conn)
+
+    def __del__(self) -> None:
+        for conn in self._connections:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self._database,
+            timeout=self._timeout,
+            cached_statements=self._cached_statements,
+            check_same_thread=False,
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _checkout(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if len(self._connections) < self._max_connections:
+                conn = self._connect()
+                self._connections.append(conn)
+                return conn
+
+        try:
+            return self._idle.get(timeout=self._timeout)
+        except queue.Empty as e:
+            raise SQLiteEngineError("No free connection left in the pool") from e
+
+    def _checkin(self, conn: sqlite3.Connection) -> None:
+        if conn.in_transaction:
+            conn.rollback()
+
+        self._idle.put(conn)
+
+    def _lease(self) -> _ConnectionLease:
+        lease: _ConnectionLease | None = getattr(self._local, "lease", None)
+
+        if lease is None:
+            lease = _ConnectionLease(self._checkout(), self._checkin)
+            self._local.lease = lease
+
+        return lease
+
+    @contextmanager
+    def _session(self) -> Iterator[None]:
+        if getattr(self._local, "lease", None) is not None:
+            yield
+            return
+
+        lease = self._lease()
+        try:
+            yield
+        finally:
+            idle = len(lease.savepoints) == 0 and not lease.conn.in_transaction
+            if idle and getattr(self._local, "lease", None) is lease:
+                del self._local.lease
+                lease.release()
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        with self._session(), super().transaction():
+            yield
+
+    def select_iter(
+        self,
+        field: str,
+        table: str,
+        conditions: dict[str, Any] | None = None,
+        chunk_size: int = 1000,
+    ) -> Iterator[Any]:
+        with self._session():
+            yield from super().select_iter(field, table, conditions, chunk_size)
+
+    select = _scoped(SqliteEngine.select)
+    query = _scoped(SqliteEngine.query)
+    insert = _scoped(SqliteEngine.insert)
+    insert_many = _scoped(SqliteEngine.insert_many)
+    upsert_many = _scoped(SqliteEngine.upsert_many)
+    update = _scoped(SqliteEngine.update)
+    delete = _scoped(SqliteEngine.delete)
+    migrate = _scoped(SqliteEngine.migrate)
+    execute_migration = _scoped(SqliteEngine.execute_migration)
+    watch = _scoped(SqliteEngine.watch)
+    check_coherence = _scoped(SqliteEngine.check_coherence)
+    column_codecs = _scoped(SqliteEngine.column_codecs)
+    convert_column = _scoped(SqliteEngine.convert_column)
+
+    def release(self) -> None:
+        lease: _ConnectionLease | None = getattr(self._local, "lease", None)
+        if lease is None:
+            return
+
+        if len(lease.savepoints) > 0:
+            raise SQLiteEngineError("Cannot release a connection inside a transaction")
+
+        del self._local.lease
+        lease.release()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        return self._lease().conn
+
+    @property
+    def _savepoints(self) -> list[dict[Hashable, Callable[[], None]]]:
+        lease: _ConnectionLease | None = getattr(self._local, "lease", None)
+        return lease.savepoints if lease is not None else []
@@ -0,0 +1,78 @@
+from dbtogo.dbmodel import DBEngineFactory, DBModel
+
+
+class AlterDuck(DBModel):
+    pk: int | None = None
+    name: str
+    owner: str | None = None
+
+    @classmethod
+    def bind(cls, engine):
+        super().bind(engine, "pk", table="test_alter", indexes=[("owner",)])
+
+
+class ColoredAlterDuck(DBModel):
+    pk: int | None = None
+    name: str
+    owner: str | None = None
+    color: str | None = None
+
+    @classmethod
+    def bind(cls, engine):
+        super().bind(engine, "pk", table="test_alter", indexes=[("owner",)])
+
+
+class RenamedAlterDuck(DBModel):
+    pk: int | None = None
+    name: str
+    keeper: str | None = None
+    color: str | None = None
+    size: str = "big"
+
+    @classmethod
+    def bind(cls, engine):
+        super().bind(engine, "pk", table="test_alter", indexes=[("keeper",)])
+
+
+class DefaultAlterDuck(DBModel):
+    pk: int | None = None
+    name: str
+    keeper: str | None = None
+    color: str | None = "brown"
+    size: str = "big"
+
+    @classmethod
+    def bind(cls, engine):
+        super().bind(engine, "pk", table="test_alter", indexes=[("keeper",)])
+
+
+def test_alter():
+    engine = DBEngineFactory.create_sqlite3_engine()
+    AlterDuck.bind(engine)
+    AlterDuck(name="Altered", owner="Scrooge").save()
+
+    statements: list[str] = []
+    engine.conn.set_trace_callback(statements.append)
+
+    ColoredAlterDuck.bind(engine)
+    assert "ALTER TABLE test_alter ADD COLUMN color TEXT NULLABLE" in statements
+    assert not any("_temp_migrate_" in x for x in statements)
+
+    statements.clear()
+    RenamedAlterDuck.bind(engine)
+    assert "ALTER TABLE test_alter RENAME COLUMN owner TO keeper" in statements
+    assert "ALTER TABLE test_alter ADD COLUMN size TEXT NOT NULL DEFAULT 'big'" in (
+        statements
+    )
+    assert not any("_temp_migrate_" in x for x in statements)
+    assert engine._get_indexes("test_alter") == [("keeper",)]
+
+    duck = RenamedAlterDuck.get(name="Altered")
+    assert duck.keeper == "Scrooge"
+    assert duck.size == "big"
+    assert duck.color is None
+
+    statements.clear()
+    DefaultAlterDuck.bind(engine)
+    assert any("_temp_migrate_" in x for x in statements)
+    assert DefaultAlterDuck.get(name="Altered").keeper == "Scrooge"
@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+
+from dbtogo.dbmodel import DBEngineFactory, DBModel
+from dbtogo.exceptions import NoBindError
+
+
+class AsyncDuck(DBModel):
+    pk: int | None = None
+    name: str
+    cash: int | None = None
+
+    @classmethod
+    def bind(cls, engine):
+        super().bind(engine, "pk", unique=["name"], table="test_async")
+
+
+async def async_crud():
+    duck = AsyncDuck(name="Async", cash=1)
+    await duck.asave()
+    assert duck.pk == 1
+
+    assert await AsyncDuck.aget(name="Async") is duck
+    assert await AsyncDuck.aget(name="Nobody") is None
+
+    ducks = [AsyncDuck(name=f"Duck{i}", cash=i) for i in range(20)]
+    await asyncio.gather(*(x.asave() for x in ducks))
+    assert sorted(x.pk for x in ducks) == list(range(2, 22))
+
+    found = await asyncio.gather(*(AsyncDuck.aget(name=x.name) for x in ducks))
+    assert all(a is b for a, b in zip(found, ducks, strict=True))
+
+    everything = await AsyncDuck.aall()
+    assert len(everything) == 21
+    assert everything[0] is duck
+
+    streamed = [x async for x in AsyncDuck.aiter_all(chunk_size=6)]
+    assert all(a is b for a, b in zip(streamed, everything, strict=True))
+
+    rich = [x async for x in AsyncDuck.where(cash__ge=15).order_by("-cash")]
+    assert [x.cash for x in rich] == [19, 18, 17, 16, 15]
+
+    await duck.adelete()
+    assert await AsyncDuck.aget(name="Async") is None
+
+
+def test_async():
+    sync_engine = DBEngineFactory.create_sqlite3_engine()
+    AsyncDuck.bind(sync_engine)
+
+    with pytest.raises(NoBindError):
+        asyncio.run(AsyncDuck.aget(name="Async"))
+
+    engine = DBEngineFactory.create_async_sqlite3_engine()
+    AsyncDuck.bind(engine)
+    assert AsyncDuck._db is engine.engine
+
+    asyncio.run(async_crud())
+    engine.close()
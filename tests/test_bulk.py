@@ -0,0 +1,38 @@
+from dbtogo.dbmodel import DBEngineFactory, DBModel
+
+
+class BulkDuck(DBModel):
+    pk: int | None = None
+    name: str
+    cash: int | None = None
+
+    @classmethod
+    def bind(cls, engine):
+        super().bind(engine, "pk", unique=["name"], table="test_bulk")
+
+
+def test_save_many():
+    engine = DBEngineFactory.create_sqlite3_engine()
+    BulkDuck.bind(engine)
+
+    first = BulkDuck(name="First")
+    first.save()
+
+    ducks = [BulkDuck(name=f"Duck{i}", cash=i if i % 2 else None) for i in range(10)]
+    ducks.append(BulkDuck(pk=100, name="Explicit"))
+    BulkDuck.save_many(ducks)
+
+    assert sorted(duck.pk for duck in ducks[:10]) == list(range(2, 12))
+    assert ducks[10].pk == 100
+    assert len(BulkDuck.all()) == 12
+
+    for duck in ducks:
+        assert BulkDuck.get(name=duck.name) is duck
+
+    first.cash = 5
+    ducks[0].cash = 7
+    BulkDuck.save_many([first, ducks[0], BulkDuck(name="Last")])
+
+    assert BulkDuck.get(pk=first.pk).cash == 5
+    assert BulkDuck.get(name="Duck0").cash == 7
+    assert BulkDuck.get(name="Last").pk == 101
@@ -0,0 +1,50 @@
+from dbtogo.dbmodel import DBEngineFactory, DBModel
+
+
+class FirstDuck(DBModel):
+    pk: int | None = None
+    name: str
+    cash: int | None = None
+
+    @classmethod
+    def bind(cls, engine):
+        super().bind(
+            engine, "pk", unique=["name"], table="test_cache_first", cache_first=True
+        )
+
+
+def test_cache_first():
+    engine = DBEngineFactory.create_sqlite3_engine()
+    FirstDuck.bind(engine)
+
+    duck = FirstDuck(name="First", cash=1)
+    duck.save()
+    loaded = FirstDuck.get(pk=engine.insert("test_cache_first", {"name": "Loaded"}))
+
+    statements: list[str] = []
+    engine.conn.set_trace_callback(statements.append)
+
+    assert FirstDuck.get(pk=duck.pk) is duck
+    assert FirstDuck.get(name="First") is duck
+    assert FirstDuck.get(name="Loaded") is loaded
+    assert statements == []
+
+    assert FirstDuck.get(name="First", cash=1) is duck
+    assert len(statements) == 1
+
+    duck.name = "Renamed"
+    assert FirstDuck.get(name="First") is duck
+    assert FirstDuck.get(name="Renamed") is None
+    assert len(statements) == 3
+
+    duck.save()
+    statements.clear()
+    assert FirstDuck.get(name="Renamed") is duck
+    assert FirstDuck.get(name="First") is None
+    assert len(statements) == 1
+
+    loaded.delete()
+    statements.clear()
+    assert FirstDuck.get(name="Loaded") is None
+    assert len(statements) == 1
+    engine.conn.set_trace_callback(None)
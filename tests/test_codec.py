@@ -0,0 +1,46 @@
+from dbtogo.dbmodel import DBEngineFactory, DBModel
+from dbtogo.serialization import GeneralSQLSerializer, JsonCodec, RowCodec
+
+
+class CodecDuck(DBModel):
+    pk: int | None = None
+    name: str
+    friends: list[str] = []
+
+    @classmethod
+    def bind(cls, engine):
+        super().bind(engine, "pk", table="test_codec")
+
+
+def test_codec():
+    engine = DBEngineFactory.create_sqlite3_engine()
+    gss = GeneralSQLSerializer()
+
+    assert gss.get_codec(CodecDuck) is not gss.get_codec(CodecDuck)
+
+    CodecDuck.bind(engine)
+    codec = gss.get_codec(CodecDuck)
+
+    assert isinstance(codec, RowCodec)
+    assert codec is gss.get_codec(CodecDuck)
+    assert codec.columns == ("pk", "name", "friends")
+    assert codec.encoded == {"friends"}
+    assert isinstance(codec.codecs["friends"], JsonCodec)
+
+    duck = CodecDuck(name="Codec", friends=["Donald"])
+    obj_data = gss.serialize_object(duck)
+    assert obj_data["name"] == "Codec"
+    assert obj_data["friends"] == '["Donald"]'
+
+    row = tuple(obj_data[name] for name in codec.columns)
+    assert gss.partially_deserialize_object(CodecDuck, row) == duck.__dict__
+
+    duck.save()
+    assert CodecDuck.all()[0] is duck
+
+    CodecDuck.bind(engine)
+    assert gss.get_codec(CodecDuck) is not codec
+
+    db_duck = CodecDuck.get(name="Codec")
+    assert db_duck is not None
+    assert db_duck.friends == ["Donald"]
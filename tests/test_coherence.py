@@ -0,0 +1,182 @@
+import sqlite3
+
+from dbtogo.dbmodel import DBEngineFactory, DBModel
+from dbtogo.instrumentation import QueryCounter
+from dbtogo.querycache import QueryCache
+
+
+class CoherentDuck(DBModel):
+    pk: int | None = None
+    name: str
+    cash: int | None = None
+
+    @classmethod
+    def bind(cls, engine):
+        super().bind(engine, "pk", table="test_coherence", coherent=True)
+
+
+def test_coherence(tmp_path):
+    database = str(tmp_path / "coherence.db")
+    engine = DBEngineFactory.create_sqlite3_engine(database, query_cache=QueryCache())
+    CoherentDuck.bind(engine)
+
+    ducks = [CoherentDuck(name=f"Duck{i}", cash=i) for i in range(3)]
+    CoherentDuck.save_many(ducks)
+    assert len(CoherentDuck.all()) == 3
+
+    statements: list[str] = []
+    engine.conn.set_trace_callback(statements.append)
+    assert len(CoherentDuck.all()) == 3
+    assert statements == ["PRAGMA data_version"]
+    engine.conn.set_trace_callback(None)
+
+    ducks[1].name = "Pending"
+
+    other = sqlite3.connect(database)
+    other.execute("UPDATE test_coherence SET cash = 100, name = 'Other'")
+    other.execute("DELETE FROM test_coherence WHERE pk = ?", (ducks[2].pk,))
+    other.commit()
+
+    everyone = CoherentDuck.all()
+    assert len(everyone) == 2
+    assert everyone[0] is ducks[0]
+    assert ducks[0].cash == 100 and ducks[0].name == "Other"
+    assert ducks[1].cash == 100 and ducks[1].name == "Pending"
+    assert CoherentDuck.get(pk=ducks[2].pk) is None
+
+    ducks[1].save()
+    assert engine.select("name", "test_coherence", {"pk": ducks[1].pk}) == [("Pending",)]
+
+    other.execute("INSERT INTO test_coherence (name, cash) VALUES ('Outside', 1)")
+    other.commit()
+    other.close()
+
+    assert CoherentDuck.get(name="Outside") is not None
+    assert len(CoherentDuck.all()) == 3
+
+
+class CoherentCachedDuck(DBModel):
+    pk: int | None = None
+    name: str
+    cash: int | None = None
+
+    @classmethod
+    def bind(cls, engine):
+        super().bind(
+            engine,
+            "pk",
+            table="test_coherence_cached",
+            unique=["name"],
+            cache_first=True,
+            coherent=True,
+        )
+
+
+def test_coherence_cache_first(tmp_path):
+    database = str(tmp_path / "coherence_cached.db")
+    engine = DBEngineFactory.create_sqlite3_engine(database)
+    CoherentCachedDuck.bind(engine)
+
+    duck = CoherentCachedDuck(name="Duck", cash=1)
+    duck.save()
+
+    other = sqlite3.connect(database)
+    other.execute("UPDATE test_coherence_cached SET cash = 5")
+    other.commit()
+
+    statements: list[str] = []
+    engine.conn.set_trace_callback(statements.append)
+    assert CoherentCachedDuck.get(pk=duck.pk) is duck
+    assert duck.cash == 5
+    engine.conn.set_trace_callback(None)
+    assert "PRAGMA data_version" in statements
+
+    other.execute("UPDATE test_coherence_cached SET cash = 6")
+    other.commit()
+    assert CoherentCachedDuck.get(name="Duck") is duck
+    assert duck.cash == 6
+
+    other.execute("UPDATE test_coherence_cached SET cash = 7")
+    other.commit()
+    other.close()
+    assert CoherentCachedDuck.get_many([duck.pk]) == [duck]
+    assert duck.cash == 7
+
+
+class CoherentKeyedDuck(DBModel):
+    pk: int | None = None
+    name: str
+    cash: int | None = None
+
+    @classmethod
+    def bind(cls, engine):
+        super().bind(engine, "pk", table="test_coherence_keyed", coherent=True)
+
+
+def test_coherence_changed_keys(tmp_path):
+    database = str(tmp_path / "coherence_keyed.db")
+    engine = DBEngineFactory.create_sqlite3_engine(database)
+    CoherentKeyedDuck.bind(engine)
+
+    ducks = [CoherentKeyedDuck(name=f"Duck{i}", cash=i) for i in range(50)]
+    CoherentKeyedDuck.save_many(ducks)
+
+    changes = []
+    engine.watch("test_coherence_keyed", lambda table, keys: changes.append(keys))
+
+    other = sqlite3.connect(database)
+    other.execute("UPDATE test_coherence_keyed SET cash = 100 WHERE pk = 7")
+    other.commit()
+
+    counter = QueryCounter()
+    engine.add_listener(counter)
+    assert CoherentKeyedDuck.get(pk=7) is ducks[6]
+    engine.remove_listener(counter)
+
+    assert changes == [[7]]
+    assert ducks[6].cash == 100
+    refreshes = [event for event in counter.events if event.operation == "query"]
+    assert [event.params for event in refreshes] == [(7,)]
+
+    other.execute("UPDATE test_coherence_keyed SET pk = 70 WHERE pk = 8")
+    other.execute("DELETE FROM test_coherence_keyed WHERE pk = 9")
+    other.commit()
+    other.close()
+
+    engine.check_coherence()
+    assert sorted(changes[-1]) == [8, 9, 70]
+    assert CoherentKeyedDuck._cache.peek(8) is None
+    assert CoherentKeyedDuck._cache.peek(9) is None
+    assert CoherentKeyedDuck._cache.peek(10) is ducks[9]
+
+
+class RewatchedDuck(DBModel):
+    pk: int | None = None
+    name: str
+
+    @classmethod
+    def bind(cls, engine):
+        super().bind(engine, "pk", table="test_coherence_rewatch", coherent=True)
+
+
+def test_coherence_rebind_keeps_triggers(tmp_path):
+    database = str(tmp_path / "rewatch.db")
+    RewatchedDuck.bind(DBEngineFactory.create_sqlite3_engine(database))
+    RewatchedDuck(name="First").save()
+
+    engine = DBEngineFactory.create_sqlite3_engine(database)
+    schema_version = engine.conn.execute("PRAGMA schema_version").fetchone()[0]
+
+    statements: list[str] = []
+    engine.conn.set_trace_callback(statements.append)
+    RewatchedDuck.bind(engine)
+    engine.conn.set_trace_callback(None)
+
+    assert engine.conn.execute("PRAGMA schema_version").fetchone()[0] == schema_version
+    assert not any(
+        statement.lstrip().upper().startswith(("INSERT", "CREATE", "DROP"))
+        for statement in statements
+    )
+
+    RewatchedDuck(name="Second").save()
+    assert engine.select("version", "_dbtogo_versions", {}) == [(2,)]
@@ -0,0 +1,51 @@
+from array import array
+
+from dbtogo.columnar import numpy
+from dbtogo.dbmodel import DBEngineFactory, DBModel
+
+
+class ColumnDuck(DBModel):
+    pk: int | None = None
+    name: str
+    cash: int = 0
+    weight: float = 1.0
+    pond: str | None = None
+    friends: list[str] = []
+
+    @classmethod
+    def bind(cls, engine):
+        super().bind(engine, "pk", table="test_columnar")
+
+
+def test_columns():
+    engine = DBEngineFactory.create_sqlite3_engine()
+    ColumnDuck.bind(engine)
+    ColumnDuck.save_many(
+        [
+            ColumnDuck(name=f"Duck{i}", cash=i, weight=i / 2, friends=[f"F{i}"])
+            for i in range(10)
+        ]
+    )
+    ColumnDuck.bind(engine)
+
+    columns = ColumnDuck.columns("cash", "weight", "pond", where={"cash__ge": 5})
+    assert list(columns) == ["cash", "weight", "pond"]
+    assert list(columns["cash"]) == [5, 6, 7, 8, 9]
+    assert list(columns["weight"]) == [2.5, 3.0, 3.5, 4.0, 4.5]
+    assert columns["pond"] == [None] * 5
+
+    if numpy is None:
+        assert columns["cash"] == array("q", [5, 6, 7, 8, 9])
+        assert columns["weight"].typecode == "d"
+    else:
+        assert columns["cash"].dtype == numpy.int64
+
+    ordered = ColumnDuck.where(cash__lt=3).order_by("-cash").columns("name", "friends")
+    assert ordered == {
+        "name": ["Duck2", "Duck1", "Duck0"],
+        "friends": [["F2"], ["F1"], ["F0"]],
+    }
+
+    assert len(ColumnDuck._cache) == 0
+    assert len(ColumnDuck.columns()["pk"]) == 10
+    assert list(ColumnDuck.columns("cash", where={"cash__gt": 100})["cash"]) == []
@@ -0,0 +1,133 @@
+import pytest
+
+from dbtogo.dbmodel import DBEngineFactory, DBModel
+
+
+class DirtyDuck(DBModel):
+    pk: int | None = None
+    name: str
+    cash: int | None = 0
+    wallet: bytes | None = None
+
+    @classmethod
+    def bind(cls, engine):
+        super().bind(engine, "pk", table="test_dirty")
+
+
+def test_dirty():
+    engine = DBEngineFactory.create_sqlite3_engine()
+    DirtyDuck.bind(engine)
+
+    statements: list[str] = []
+    engine.conn.set_trace_callback(statements.append)
+
+    duck = DirtyDuck(name="Dirty", wallet=b"\x00" * 1024)
+    duck.save()
+    assert duck._dirty == set()
+
+    statements.clear()
+    duck.save()
+    assert statements == []
+
+    duck.cash = 10
+    duck.save()
+    updates = [x for x in statements if x.startswith("UPDATE")]
+    assert updates == [f"UPDATE test_dirty SET cash = 10 WHERE pk = {duck.pk}"]
+
+    duck.cash = None
+    duck.save()
+    assert DirtyDuck.get(name="Dirty").cash is None
+
+    duck.wallet = b"\x01"
+    duck.wallet = duck.wallet + b"\x02"
+    duck.save()
+    assert duck._dirty == set()
+
+    with pytest.raises(RuntimeError):
+        with DirtyDuck.atomic():
+            duck.cash = 5
+            duck.save()
+            raise RuntimeError()
+
+    assert duck._dirty == {"cash"}
+    assert DirtyDuck.get(name="Dirty").cash == 5
+    duck.save()
+
+    duck.mark_dirty("name")
+    assert duck._dirty == {"name"}
+    duck.save()
+
+    duck.pk = 42
+    duck.save()
+    assert DirtyDuck.get(pk=42) is duck
+    assert DirtyDuck.get(pk=1) is None
+
+    engine.conn.set_trace_callback(None)
+    pk, wallet = engine.conn.execute("SELECT pk, wallet FROM test_dirty").fetchone()
+    assert pk == 42
+    assert wallet is not None
+
+    duck.delete()
+    assert len(DirtyDuck.all()) == 0
+
+
+class MutableDuck(DBModel):
+    pk: int | None = None
+    name: str
+    tags: list[str] = []
+    extra: dict[str, int] = {}
+    photo: bytes = b""
+    labels: tuple[str, ...] = ()
+
+    @classmethod
+    def bind(cls, engine):
+        super().bind(engine, "pk", table="test_dirty_mutable")
+
+
+def test_dirty_in_place():
+    engine = DBEngineFactory.create_sqlite3_engine()
+    MutableDuck.bind(engine)
+
+    duck = MutableDuck(name="Mutable")
+    duck.save()
+
+    statements: list[str] = []
+    engine.conn.set_trace_callback(statements.append)
+
+    duck.save()
+    assert statements == []
+
+    duck.tags.append("x")
+    duck.save()
+    updates = [x for x in statements if x.startswith("UPDATE")]
+    assert updates == [
+        f"UPDATE test_dirty_mutable SET tags = '[\"x\"]' WHERE pk = {duck.pk}"
+    ]
+
+    statements.clear()
+    duck.save()
+    assert statements == []
+    engine.conn.set_trace_callback(None)
+
+    loaded = next(MutableDuck.iter_all())
+    assert loaded.tags == ["x"]
+    loaded.extra["a"] = 1
+    loaded.save()
+
+    assert engine.select("tags, extra", "test_dirty_mutable") == [('["x"]', '{"a":1}')]
+
+    MutableDuck.bind(engine)
+    assert MutableDuck._codec.mutable == {"tags", "extra", "labels"}
+
+    reloaded = MutableDuck.get(pk=duck.pk)
+    assert reloaded._encoded == {}
+
+    statements.clear()
+    engine.conn.set_trace_callback(statements.append)
+    reloaded.save()
+    assert statements == []
+
+    reloaded.tags.append("y")
+    reloaded.save()
+    engine.conn.set_trace_callback(None)
+    assert engine.select("tags", "test_dirty_mutable") == [('["x","y"]',)]
@@ -3,6 +3,7 @@ import pytest
 from dbtogo.exceptions import (
     DestructiveMigrationError,
     InvalidMigrationError,
+    InvalidQueryError,
     NoBindError,
     UnboundDeleteError,
 )
@@ -15,6 +16,9 @@ def test_exceptions():
     with pytest.raises(InvalidMigrationError):
         raise InvalidMigrationError
 
+    with pytest.raises(InvalidQueryError):
+        raise InvalidQueryError("reason")
+
     with pytest.raises(NoBindError):
         raise NoBindError
 
@@ -0,0 +1,46 @@
+from dbtogo.datatypes import AddCol, Migration, SQLColumn
+from dbtogo.dbmodel import DBEngineFactory, DBModel
+
+
+class PrintDuck(DBModel):
+    pk: int | None = None
+    name: str
+
+    @classmethod
+    def bind(cls, engine):
+        super().bind(engine, "pk", table="test_fingerprint", indexes=[("name",)])
+
+
+class GrownPrintDuck(DBModel):
+    pk: int | None = None
+    name: str
+    cash: int | None = None
+
+    @classmethod
+    def bind(cls, engine):
+        super().bind(engine, "pk", table="test_fingerprint", indexes=[("name",)])
+
+
+def test_fingerprint(tmp_path):
+    database = str(tmp_path / "fingerprint.db")
+    PrintDuck.bind(DBEngineFactory.create_sqlite3_engine(database))
+
+    engine = DBEngineFactory.create_sqlite3_engine(database)
+    fingerprint = engine._get_fingerprint("test_fingerprint")
+    assert fingerprint is not None
+
+    statements: list[str] = []
+    engine.conn.set_trace_callback(statements.append)
+    PrintDuck.bind(engine)
+    assert not any("PRAGMA table_info" in x for x in statements)
+
+    GrownPrintDuck.bind(engine)
+    engine.conn.set_trace_callback(None)
+    assert any("ADD COLUMN cash" in x for x in statements)
+    assert engine._get_fingerprint("test_fingerprint") not in [None, fingerprint]
+
+    migration = Migration(
+        "test_fingerprint", [AddCol(SQLColumn("color", "string", True, None))]
+    )
+    engine.execute_migration(migration)
+    assert engine._get_fingerprint("test_fingerprint") is None
@@ -0,0 +1,81 @@
+from dbtogo.dbmodel import DBEngineFactory, DBModel
+
+
+class ManyDuck(DBModel):
+    pk: int | None = None
+    name: str
+
+    @classmethod
+    def bind(cls, engine):
+        super().bind(engine, "pk", table="test_get_many", cache_first=True)
+
+
+def test_get_many():
+    engine = DBEngineFactory.create_sqlite3_engine()
+    ManyDuck.bind(engine)
+
+    for i in range(20):
+        engine.insert("test_get_many", {"name": f"Duck{i}"})
+
+    live = ManyDuck.get(pk=3)
+    live.pk = 300
+
+    statements: list[str] = []
+    engine.conn.set_trace_callback(statements.append)
+
+    keys = [7, 300, 1, 99, 7, None, 12, 5]
+    ducks = ManyDuck.get_many(keys, chunk_size=2)
+    engine.conn.set_trace_callback(None)
+
+    assert [x.name if x is not None else None for x in ducks] == [
+        "Duck6",
+        "Duck2",
+        "Duck0",
+        None,
+        "Duck6",
+        None,
+        "Duck11",
+        "Duck4",
+    ]
+    assert ducks[1] is live
+    assert ducks[0] is ducks[4]
+    assert ManyDuck.get(pk=12) is ducks[6]
+
+    queries = [x for x in statements if x.startswith("SELECT")]
+    assert len(queries) == 3
+    assert all("pk IN" in x for x in queries)
+
+    statements.clear()
+    engine.conn.set_trace_callback(statements.append)
+    assert ManyDuck.get_many([1, 7]) == [ducks[2], ducks[0]]
+    engine.conn.set_trace_callback(None)
+    assert statements == []
+
+
+class FetchedDuck(DBModel):
+    pk: int | None = None
+    name: str
+
+    @classmethod
+    def bind(cls, engine):
+        super().bind(engine, "pk", table="test_get_many_fetched")
+
+
+def test_get_many_not_retained():
+    engine = DBEngineFactory.create_sqlite3_engine()
+    FetchedDuck.bind(engine)
+    engine.insert_many("test_get_many_fetched", [{"name": f"Duck{i}"} for i in range(5)])
+
+    duck = FetchedDuck.get(pk=1)
+    others = FetchedDuck.get_many([2, 3])
+    assert len(FetchedDuck._cache) == 0
+    assert [x.name for x in others] == ["Duck1", "Duck2"]
+
+    duck.name = "Saved"
+    duck.save()
+    assert FetchedDuck.get(pk=1) is duck
+    assert engine.select("name", "test_get_many_fetched", {"pk": 1}) == [("Saved",)]
+
+    others[0].delete()
+    assert FetchedDuck.get(pk=2) is None
+    assert len(FetchedDuck.all()) == 4
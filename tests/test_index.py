@@ -0,0 +1,87 @@
+from dbtogo.datatypes import AddIndex, DropIndex
+from dbtogo.dbmodel import DBEngineFactory, DBModel
+from dbtogo.migrations import MigrationEngine
+
+
+class IndexDuck(DBModel):
+    pk: int | None = None
+    name: str
+    owner: str | None = None
+    created: int | None = None
+
+    @classmethod
+    def bind(cls, engine, indexes=[("name",), ("owner", "created")]):
+        super().bind(engine, "pk", table="test_index", indexes=indexes)
+
+
+class RebuiltIndexDuck(DBModel):
+    pk: int | None = None
+    name: str
+    owner: str | None = None
+    created: int | None = None
+    color: str | None = None
+
+    @classmethod
+    def bind(cls, engine):
+        super().bind(engine, "pk", table="test_index", indexes=[("owner", "created")])
+
+
+def test_generate_index_migration():
+    migration = MigrationEngine().generate_migration(
+        "test", [], [], [("a",), ("b", "c")], [("b", "c"), ("d",)]
+    )
+
+    assert [type(x) for x in migration.steps] == [DropIndex, AddIndex]
+    assert migration.steps[0].columns == ("a",)
+    assert migration.steps[1].columns == ("d",)
+    assert not migration.is_destructive()
+
+
+def test_indexes():
+    engine = DBEngineFactory.create_sqlite3_engine()
+
+    IndexDuck.bind(engine)
+    assert engine._get_indexes("test_index") == [("name",), ("owner", "created")]
+
+    IndexDuck(name="Indexed", owner="Scrooge", created=1).save()
+
+    plan = engine.conn.execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM test_index WHERE name = 'a'"
+    )
+    assert engine._index_name("test_index", ("name",)) in str(plan.fetchall())
+
+    IndexDuck.bind(engine, indexes=[("owner", "created")])
+    assert engine._get_indexes("test_index") == [("owner", "created")]
+
+    RebuiltIndexDuck.bind(engine)
+    assert engine._get_indexes("test_index") == [("owner", "created")]
+    assert RebuiltIndexDuck.get(name="Indexed").owner == "Scrooge"
+
+
+class CollidingIndexDuck(DBModel):
+    pk: int | None = None
+    a: int | None = None
+    b: int | None = None
+    a_b: int | None = None
+
+    @classmethod
+    def bind(cls, engine, indexes=[("a", "b"), ("a_b",)]):
+        super().bind(engine, "pk", table="test_index_collision", indexes=indexes)
+
+
+def test_index_name_collision():
+    engine = DBEngineFactory.create_sqlite3_engine()
+
+    CollidingIndexDuck.bind(engine)
+    assert engine._get_indexes("test_index_collision") == [("a", "b"), ("a_b",)]
+
+    CollidingIndexDuck.bind(engine, indexes=[("a_b",)])
+    assert engine._get_indexes("test_index_collision") == [("a_b",)]
+
+    engine.conn.execute(
+        "CREATE INDEX ix_test_index_collision_a ON test_index_collision (a)"
+    )
+    engine._invalidate_schema("test_index_collision")
+    CollidingIndexDuck.bind(engine)
+    indexes = engine._get_indexes("test_index_collision")
+    assert sorted(indexes) == [("a", "b"), ("a_b",)]
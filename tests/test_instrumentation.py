@@ -0,0 +1,161 @@
+import logging
+import sqlite3
+
+import pytest
+
+from dbtogo.datatypes import DropCol, Migration
+from dbtogo.dbmodel import DBEngineFactory, DBModel
+from dbtogo.instrumentation import (
+    LatencyHistogram,
+    QueryCounter,
+    QueryEvent,
+    QueryListener,
+    SlowQueryLogger,
+    assert_num_queries,
+)
+
+
+class WatchedDuck(DBModel):
+    pk: int | None = None
+    name: str
+    cash: int | None = None
+
+    @classmethod
+    def bind(cls, engine):
+        super().bind(engine, "pk", table="test_instrumentation")
+
+
+class Recorder(QueryListener):
+    def __init__(self):
+        self.calls: list[tuple[str, str]] = []
+
+    def before(self, event: QueryEvent) -> None:
+        self.calls.append(("before", event.sql))
+
+    def after(self, event: QueryEvent) -> None:
+        self.calls.append(("after", event.sql))
+
+
+def test_instrumentation(caplog):
+    engine = DBEngineFactory.create_sqlite3_engine()
+
+    counter = QueryCounter()
+    histogram = LatencyHistogram()
+    recorder = Recorder()
+    for listener in [counter, histogram, recorder]:
+        engine.add_listener(listener)
+
+    WatchedDuck.bind(engine)
+    assert counter.for_model(WatchedDuck) == {"migrate": 1}
+
+    duck = WatchedDuck(name="Watched")
+    duck.save()
+    duck.cash = 5
+    duck.save()
+    WatchedDuck.save_many([WatchedDuck(name=f"Duck{i}") for i in range(3)])
+    assert len(WatchedDuck.where(cash=5)) == 1
+
+    assert counter.for_model(WatchedDuck) == {
+        "migrate": 1,
+        "insert": 2,
+        "update": 1,
+        "query": 1,
+    }
+    assert recorder.calls[0][0] == "before" and recorder.calls[1][0] == "after"
+
+    inserted = [x for x in counter.events if x.operation == "insert"]
+    assert inserted[0].params == ("Watched",)
+    assert inserted[1].rowcount == 3
+    assert all(x.elapsed_ns > 0 for x in counter.events)
+
+    assert histogram.count == counter.total
+    assert sum(histogram.stats()["buckets"].values()) == counter.total
+    assert histogram.percentile(50) is not None
+
+    slow = SlowQueryLogger(threshold_ms=0)
+    engine.add_listener(slow)
+    with caplog.at_level(logging.WARNING, logger="dbtogo"):
+        WatchedDuck.get(name="Watched")
+    engine.remove_listener(slow)
+    assert slow.slow_queries == 1
+    assert "Slow query on test_instrumentation" in caplog.text
+
+    with assert_num_queries(engine, 1):
+        duck.delete()
+
+    with pytest.raises(AssertionError, match="Expected 0 queries, 1 were issued"):
+        with assert_num_queries(engine, 0):
+            WatchedDuck.all()
+
+
+class FailingDuck(DBModel):
+    pk: int | None = None
+    name: str
+
+    @classmethod
+    def bind(cls, engine):
+        super().bind(engine, "pk", table="test_instrumentation_error", unique=["name"])
+
+
+def test_instrumentation_error():
+    engine = DBEngineFactory.create_sqlite3_engine()
+    FailingDuck.bind(engine)
+    FailingDuck(name="Taken").save()
+
+    counter = QueryCounter()
+    recorder = Recorder()
+    engine.add_listener(counter)
+    engine.add_listener(recorder)
+
+    with pytest.raises(sqlite3.IntegrityError):
+        FailingDuck(name="Taken").save()
+
+    assert [call[0] for call in recorder.calls] == ["before", "after"]
+    event = counter.events[0]
+    assert isinstance(event.error, sqlite3.IntegrityError)
+    assert event.elapsed_ns > 0
+    assert event.rowcount == -1
+
+    FailingDuck(name="Free").save()
+    assert counter.events[1].error is None
+
+
+class BookkeepingDuck(DBModel):
+    pk: int | None = None
+    name: str
+    cash: int | None = None
+
+    @classmethod
+    def bind(cls, engine):
+        super().bind(engine, "pk", table="test_instrumentation_books", coherent=True)
+
+
+def test_instrumentation_bookkeeping(tmp_path):
+    database = str(tmp_path / "books.db")
+    engine = DBEngineFactory.create_sqlite3_engine(database)
+    counter = QueryCounter()
+    engine.add_listener(counter)
+
+    BookkeepingDuck.bind(engine)
+    assert counter.for_table("_dbtogo_schema") == {"migrate": 2}
+    assert counter.for_table("_dbtogo_versions")["select"] == 2
+    BookkeepingDuck.save_many([BookkeepingDuck(name=f"Duck{i}") for i in range(3)])
+
+    other = sqlite3.connect(database)
+    other.execute("UPDATE test_instrumentation_books SET cash = 1")
+    other.commit()
+    other.close()
+
+    counter.reset()
+    assert len(BookkeepingDuck.all()) == 3
+    assert counter.for_table("_dbtogo_versions") == {"select": 3}
+    assert counter.for_table("_dbtogo_changelog") == {"select": 1}
+
+    counter.reset()
+    migration = Migration("test_instrumentation_books", [DropCol("cash")])
+    engine.execute_migration(migration, True, chunk_size=2)
+
+    assert counter.for_table("_dbtogo_migrations")["migrate"] == 6
+    temp_table = "_temp_migrate_test_instrumentation_books"
+    assert counter.for_table(temp_table)["migrate"] == 5
+    assert any(x.sql.startswith(f"DELETE FROM {temp_table}") for x in counter.events)
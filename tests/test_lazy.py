@@ -0,0 +1,39 @@
+from dbtogo.dbmodel import DBEngineFactory, DBModel, LazyQueryList
+
+
+class LazyDuck(DBModel):
+    pk: int | None = None
+    name: str
+
+    @classmethod
+    def bind(cls, engine):
+        super().bind(engine, "pk", table="test_lazy")
+
+
+def test_lazy_query_list():
+    engine = DBEngineFactory.create_sqlite3_engine()
+    LazyDuck.bind(engine)
+
+    engine.insert_many("test_lazy", [{"name": f"Duck{i}"} for i in range(10)])
+
+    ducks = LazyDuck.all()
+    assert len(ducks) == 10
+    assert ducks[3] is ducks[3]
+    assert ducks[-1].name == "Duck9"
+
+    page = ducks[2:8]
+    assert isinstance(page, LazyQueryList)
+    assert page._objects_data is ducks._objects_data
+    assert len(page) == 6
+    assert page[0] is ducks[2]
+    assert [duck.name for duck in page[::2]] == ["Duck2", "Duck4", "Duck6"]
+    assert len(ducks[20:]) == 0
+
+    assert [duck.pk for duck in ducks] == list(range(1, 11))
+    assert list(page[1:3]) == [ducks[3], ducks[4]]
+
+    assert len(ducks._memo) == 10
+
+    unmemoized = LazyDuck.all(memoize=False)
+    assert unmemoized._memo is None
+    assert unmemoized[0].model_dump() == ducks[0].model_dump()
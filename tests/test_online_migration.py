@@ -0,0 +1,79 @@
+import pytest
+
+from dbtogo.datatypes import AddCol, DropCol, Migration, RenameCol, SQLColumn
+from dbtogo.dbmodel import DBEngineFactory, DBModel
+
+
+class OnlineDuck(DBModel):
+    pk: int | None = None
+    name: str
+    cash: int | None = None
+    pond: str | None = None
+
+    @classmethod
+    def bind(cls, engine):
+        super().bind(engine, "pk", table="test_online", indexes=[("name",)])
+
+
+class Interrupted(Exception):
+    pass
+
+
+def test_online_migration():
+    engine = DBEngineFactory.create_sqlite3_engine()
+    OnlineDuck.bind(engine)
+    OnlineDuck.save_many([OnlineDuck(name=f"Duck{i}", cash=i) for i in range(50)])
+
+    migration = Migration(
+        "test_online",
+        [
+            DropCol("pond"),
+            RenameCol("cash", "money"),
+            AddCol(SQLColumn("color", "string", True, "brown")),
+        ],
+    )
+
+    calls: list[tuple[int, int]] = []
+
+    def interrupt(copied: int, total: int) -> None:
+        calls.append((copied, total))
+        if len(calls) == 3:
+            raise Interrupted()
+
+    with pytest.raises(Interrupted):
+        engine.execute_migration(migration, True, chunk_size=7, progress=interrupt)
+
+    assert calls == [(7, 50), (14, 50), (21, 50)]
+    assert [x.name for x in engine._get_SQLColumns("test_online")][:3] == [
+        "pk",
+        "name",
+        "cash",
+    ]
+
+    early = OnlineDuck.get(name="Duck3")
+    early.cash = 300
+    early.save()
+    OnlineDuck.get(name="Duck4").delete()
+    OnlineDuck(name="Late", cash=1).save()
+
+    calls.clear()
+    engine.execute_migration(
+        migration, True, chunk_size=7, progress=lambda *x: calls.append(x)
+    )
+
+    assert calls[0] == (28, 50)
+    assert calls[-1][0] == 51
+
+    rows = engine.select("pk, money, color", "test_online")
+    assert len(rows) == 50
+    assert engine.select("money", "test_online", {"name": "Duck3"}) == [(300,)]
+    assert engine.select("money", "test_online", {"name": "Duck4"}) == []
+    assert engine.select("money", "test_online", {"name": "Late"}) == [(1,)]
+    assert engine._get_indexes("test_online") == [("name",)]
+
+    leftovers = engine.conn.execute(
+        "SELECT name FROM sqlite_master WHERE name LIKE '%test_online%'"
+    ).fetchall()
+    index = engine._index_name("test_online", ("name",))
+    assert sorted(leftovers) == [(index,), ("test_online",)]
+    assert engine.select("table_name", "_dbtogo_migrations") == []
@@ -0,0 +1,196 @@
+import threading
+
+import pytest
+
+from dbtogo.dbmodel import DBEngineFactory, DBModel
+from dbtogo.sqlite import SQLiteEngineError
+
+
+class PoolDuck(DBModel):
+    pk: int | None = None
+    name: str
+    cash: int | None = None
+
+    @classmethod
+    def bind(cls, engine):
+        super().bind(engine, "pk", unique=["name"], table="test_pool")
+
+
+def test_pool(tmp_path):
+    with pytest.raises(SQLiteEngineError):
+        DBEngineFactory.create_sqlite3_pool_engine(":memory:")
+
+    engine = DBEngineFactory.create_sqlite3_pool_engine(
+        str(tmp_path / "pool.db"), max_connections=4, timeout=0.1
+    )
+    PoolDuck.bind(engine)
+
+    assert engine.conn is engine.conn
+    assert engine.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    errors = []
+    connections = set()
+    barrier = threading.Barrier(3)
+
+    def worker(number):
+        try:
+            connections.add(id(engine.conn))
+            barrier.wait()
+
+            with PoolDuck.atomic():
+                for i in range(20):
+                    PoolDuck(name=f"Duck{number}-{i}", cash=i).save()
+
+            assert len(PoolDuck.where(name__like=f"Duck{number}-%")) == 20
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(connections) == 3
+    assert id(engine.conn) not in connections
+    assert len(PoolDuck.all()) == 60
+    assert len(engine._connections) == 4
+
+    reused = []
+    thread = threading.Thread(target=lambda: reused.append(id(engine.conn)))
+    thread.start()
+    thread.join()
+    assert reused[0] in connections
+    assert len(engine._connections) == 4
+
+    blockers = [threading.Event() for _ in range(4)]
+    holding = threading.Barrier(5)
+
+    def hold(event):
+        engine.conn.execute("SELECT 1")
+        holding.wait()
+        event.wait()
+
+    holders = [threading.Thread(target=hold, args=(x,)) for x in blockers[:3]]
+    for thread in holders:
+        thread.start()
+
+    failed = []
+
+    def starve():
+        holding.wait()
+        try:
+            engine.conn.execute("SELECT 1")
+        except SQLiteEngineError as e:
+            failed.append(e)
+
+    starved = threading.Thread(target=starve)
+    starved.start()
+    holding.wait()
+    starved.join()
+    assert len(failed) == 1
+
+    for event in blockers:
+        event.set()
+    for thread in holders:
+        thread.join()
+
+    engine.release()
+    assert len(engine._connections) == 4
+
+
+class SharedDuck(DBModel):
+    pk: int | None = None
+    name: str
+
+    @classmethod
+    def bind(cls, engine):
+        super().bind(engine, "pk", table="test_pool_shared", cache_first=True)
+
+
+def test_pool_rollback_isolation(tmp_path):
+    engine = DBEngineFactory.create_sqlite3_pool_engine(str(tmp_path / "shared.db"))
+    SharedDuck.bind(engine)
+    engine.insert_many("test_pool_shared", [{"name": "B"}, {"name": "C"}])
+    renamed = SharedDuck.get(name="C")
+
+    started, loaded = threading.Event(), threading.Event()
+    errors = []
+
+    def rollback():
+        try:
+            with SharedDuck.atomic():
+                SharedDuck(name="A").save()
+                started.set()
+                loaded.wait()
+                raise RuntimeError()
+        except RuntimeError:
+            pass
+
+    def load():
+        started.wait()
+        try:
+            SharedDuck.get(name="B")
+            renamed.pk = 30
+        except Exception as e:
+            errors.append(e)
+        loaded.set()
+
+    threads = [threading.Thread(target=rollback), threading.Thread(target=load)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    loaded_b = SharedDuck._cache.get(1)
+    assert loaded_b is not None
+    assert SharedDuck.get(name="B") is loaded_b
+    assert SharedDuck.get(name="A") is None
+
+    renamed.save()
+    assert engine.select("name", "test_pool_shared", {"pk": 30}) == [("C",)]
+
+
+class BusyDuck(DBModel):
+    pk: int | None = None
+    name: str
+    cash: int = 0
+
+    @classmethod
+    def bind(cls, engine):
+        super().bind(engine, "pk", table="test_pool_busy")
+
+
+def test_pool_more_threads_than_connections(tmp_path):
+    engine = DBEngineFactory.create_sqlite3_pool_engine(
+        str(tmp_path / "busy.db"), max_connections=2, timeout=5.0
+    )
+    BusyDuck.bind(engine)
+
+    errors = []
+
+    def worker(number):
+        try:
+            for i in range(5):
+                duck = BusyDuck(name=f"Duck{number}-{i}")
+                duck.save()
+                with BusyDuck.atomic():
+                    duck.cash = i
+                    duck.save()
+                assert BusyDuck.get(name=f"Duck{number}-{i}").cash == i
+                list(BusyDuck.iter_all(chunk_size=2))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(BusyDuck.all()) == 30
+    assert len(engine._connections) == 2
+    assert engine._idle.qsize() == 2
@@ -0,0 +1,52 @@
+import pytest
+
+from dbtogo.dbmodel import DBEngineFactory, DBModel
+from dbtogo.exceptions import InvalidQueryError, NoBindError
+
+
+class QueryDuck(DBModel):
+    pk: int | None = None
+    name: str
+    cash: int | None = None
+
+    @classmethod
+    def bind(cls, engine):
+        super().bind(engine, "pk", unique=["name"], table="test_query")
+
+
+def test_query():
+    with pytest.raises(NoBindError):
+        QueryDuck.where(cash__gt=100)
+
+    engine = DBEngineFactory.create_sqlite3_engine()
+    QueryDuck.bind(engine)
+
+    ducks = [QueryDuck(name=f"Duck{i}", cash=i * 10) for i in range(20)]
+    ducks.append(QueryDuck(name="Broke"))
+    QueryDuck.save_many(ducks)
+
+    rich = QueryDuck.where(cash__gt=100).order_by("-cash")
+    assert [duck.cash for duck in rich] == list(range(190, 100, -10))
+    assert rich[0] is ducks[19]
+
+    page = rich.limit(3).offset(2)
+    assert [duck.name for duck in page] == ["Duck17", "Duck16", "Duck15"]
+    assert len(rich) == 9
+
+    assert len(QueryDuck.where(cash=None)) == 1
+    assert len(QueryDuck.where(cash__ne=None)) == 20
+    assert len(QueryDuck.where(cash__isnull=True)) == 1
+    assert len(QueryDuck.where(name__like="Duck1%")) == 11
+    assert len(QueryDuck.where(cash__in=[0, 10, 20], name__ne="Duck0")) == 2
+    assert len(QueryDuck.where(cash__in=[])) == 0
+    assert len(QueryDuck.where(cash__ge=50, cash__lt=80)) == 3
+    assert len(QueryDuck.where().offset(18)) == 3
+
+    assert QueryDuck.where(cash__le=0).first() is ducks[0]
+    assert QueryDuck.where(cash__lt=0).first() is None
+
+    with pytest.raises(InvalidQueryError):
+        QueryDuck.where(feathers__gt=3)
+
+    with pytest.raises(InvalidQueryError):
+        QueryDuck.where().order_by("-feathers")
@@ -0,0 +1,103 @@
+import threading
+import time
+
+import pytest
+
+from dbtogo.dbmodel import DBEngineFactory, DBModel
+from dbtogo.querycache import QueryCache
+
+
+class CachedDuck(DBModel):
+    pk: int | None = None
+    name: str
+    cash: int | None = None
+
+    @classmethod
+    def bind(cls, engine):
+        super().bind(engine, "pk", table="test_query_cache")
+
+
+def test_query_cache():
+    cache = QueryCache(max_size=2)
+    engine = DBEngineFactory.create_sqlite3_engine(query_cache=cache)
+    CachedDuck.bind(engine)
+    CachedDuck.save_many([CachedDuck(name=f"Duck{i}", cash=i) for i in range(5)])
+
+    statements: list[str] = []
+    engine.conn.set_trace_callback(statements.append)
+
+    assert len(CachedDuck.all()) == 5
+    assert len(CachedDuck.all()) == 5
+    assert len(CachedDuck.where(cash__ge=3)) == 2
+    assert len(CachedDuck.where(cash__ge=3)) == 2
+    assert len(statements) == 2
+
+    CachedDuck(name="New", cash=9).save()
+    statements.clear()
+    assert len(CachedDuck.all()) == 6
+    assert len(statements) == 1
+
+    CachedDuck.get(name="Duck1")
+    CachedDuck.get(name="Duck2")
+    assert len(cache) == 2
+    assert cache.evictions == 2
+
+    with pytest.raises(KeyError):
+        with engine.transaction():
+            CachedDuck.get(name="Duck2").delete()
+            assert CachedDuck.get(name="Duck2") is None
+            raise KeyError()
+
+    assert CachedDuck.get(name="Duck2") is not None
+    engine.conn.set_trace_callback(None)
+
+    stats = cache.stats()
+    assert stats["hits"] == 2
+    assert 0 < stats["hit_ratio"] < 1
+    assert stats["memory"] > 0
+
+
+def test_query_cache_ttl():
+    cache = QueryCache(ttl=0.05)
+    cache.set("ducks", "SELECT", (), [(1,)], cache.generation("ducks"))
+    assert cache.get("ducks", "SELECT", ()) == [(1,)]
+
+    cache.set("ducks", "SELECT", (), [(1,)], cache.generation("ducks") - 1)
+    time.sleep(0.06)
+    assert cache.get("ducks", "SELECT", ()) is None
+    assert len(cache) == 0
+
+
+def test_query_cache_pooled_transaction(tmp_path):
+    engine = DBEngineFactory.create_sqlite3_pool_engine(
+        str(tmp_path / "query_cache.db"), query_cache=QueryCache()
+    )
+    CachedDuck.bind(engine)
+
+    written = threading.Event()
+    read = threading.Event()
+    seen: dict[str, list] = {}
+
+    def writer() -> None:
+        with pytest.raises(KeyError):
+            with engine.transaction():
+                engine.insert("test_query_cache", {"name": "uncommitted"})
+                seen["writer"] = engine.select("pk, name", "test_query_cache")
+                written.set()
+                read.wait(5)
+                raise KeyError()
+
+    def reader() -> None:
+        written.wait(5)
+        seen["reader"] = engine.select("pk, name", "test_query_cache")
+        read.set()
+
+    threads = [threading.Thread(target=writer), threading.Thread(target=reader)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert seen["writer"] == [(1, "uncommitted")]
+    assert seen["reader"] == []
+    assert engine.select("pk, name", "test_query_cache") == []
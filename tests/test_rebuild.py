@@ -0,0 +1,67 @@
+import sqlite3
+
+import pytest
+
+from dbtogo.datatypes import AddCol, DropCol, Migration, RenameCol, SQLColumn
+from dbtogo.dbmodel import DBEngineFactory, DBModel
+
+
+class RebuildDuck(DBModel):
+    pk: int | None = None
+    name: str
+    cash: int | None = None
+    pond: str | None = None
+    toys: list[str] = ["ball"]
+
+    @classmethod
+    def bind(cls, engine):
+        super().bind(engine, "pk", table="test_rebuild", indexes=[("name",)])
+
+
+def test_rebuild():
+    engine = DBEngineFactory.create_sqlite3_engine()
+    RebuildDuck.bind(engine)
+    RebuildDuck.save_many([RebuildDuck(name=f"Duck{i}", cash=i) for i in range(50)])
+
+    statements: list[str] = []
+    engine.conn.set_trace_callback(statements.append)
+
+    migration = Migration(
+        "test_rebuild",
+        [
+            DropCol("pond"),
+            RenameCol("cash", "money"),
+            AddCol(SQLColumn("color", "string", True, "brown")),
+        ],
+    )
+    engine.execute_migration(migration, force=True)
+    engine.conn.set_trace_callback(None)
+
+    assert [x for x in statements if x.startswith("INSERT")] == [
+        "INSERT INTO _temp_migrate_test_rebuild (pk, name, money, toys) "
+        "SELECT pk, name, cash, toys FROM test_rebuild"
+    ]
+    assert statements.count("COMMIT") == 1
+
+    rows = engine.select("pk, name, money, color", "test_rebuild", {"name": "Duck7"})
+    assert rows == [(8, "Duck7", 7, "brown")]
+    assert engine._get_indexes("test_rebuild") == [("name",)]
+
+    broken = Migration(
+        "test_rebuild", [AddCol(SQLColumn("required", "integer", False, None))]
+    )
+    with pytest.raises(sqlite3.IntegrityError):
+        engine.execute_migration(broken)
+
+    assert [x.name for x in engine._get_SQLColumns("test_rebuild")] == [
+        "pk",
+        "name",
+        "toys",
+        "color",
+        "money",
+    ]
+    assert len(engine.select("pk", "test_rebuild")) == 50
+    assert (
+        engine.select("name", "sqlite_master", {"name": "_temp_migrate_test_rebuild"})
+        == []
+    )
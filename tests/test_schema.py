@@ -0,0 +1,44 @@
+from dbtogo.dbmodel import DBEngineFactory, DBModel
+
+
+class SchemaDuck(DBModel):
+    pk: int | None = None
+    name: str
+    motto: str = "quack, (loudly) it's fine"
+    cash: int = 0
+    weight: float = 1.5
+    swims: bool = True
+
+    @classmethod
+    def bind(cls, engine):
+        super().bind(engine, "pk", unique=["name"], table="test_schema")
+
+
+def test_schema():
+    engine = DBEngineFactory.create_sqlite3_engine()
+    SchemaDuck.bind(engine)
+
+    columns = {x.name: x for x in engine._get_SQLColumns("test_schema")}
+    assert columns["pk"].primary_key and not columns["pk"].nullable
+    assert columns["name"].unique and not columns["motto"].unique
+    assert columns["motto"].default == "quack, (loudly) it's fine"
+    assert columns["cash"].default == 0
+    assert columns["weight"].default == 1.5
+    assert columns["swims"].default is True
+
+    statements: list[str] = []
+    engine.conn.set_trace_callback(statements.append)
+
+    SchemaDuck.bind(engine)
+    assert not any("PRAGMA table_info" in x for x in statements)
+    assert not any(x.startswith(("ALTER", "CREATE", "INSERT")) for x in statements)
+
+    engine.conn.execute("ALTER TABLE test_schema ADD COLUMN extra TEXT NULLABLE")
+    assert "extra" in [x.name for x in engine._get_SQLColumns("test_schema")]
+    assert any("PRAGMA table_info" in x for x in statements)
+    engine.conn.set_trace_callback(None)
+
+    SchemaDuck(name="Schema").save()
+    duck = SchemaDuck.get(name="Schema")
+    assert duck.motto == "quack, (loudly) it's fine"
+    assert duck.cash == 0
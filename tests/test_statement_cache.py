@@ -0,0 +1,35 @@
+from dbtogo.dbmodel import DBEngineFactory, DBModel
+
+
+class StatementDuck(DBModel):
+    pk: int | None = None
+    name: str
+    cash: int | None = None
+
+    @classmethod
+    def bind(cls, engine):
+        super().bind(engine, "pk", table="test_statement_cache")
+
+
+def test_statement_cache():
+    engine = DBEngineFactory.create_sqlite3_engine(cached_statements=16)
+    StatementDuck.bind(engine)
+
+    for i in range(5):
+        StatementDuck(name=f"Duck{i}", cash=i if i % 2 else None).save()
+
+    inserts = [key for key in engine._statements.keys() if key[0] == "insert"]
+    assert len(inserts) == 2
+
+    for i in range(5):
+        StatementDuck.where(cash__in=[1, 3], name__ne="x").limit(2).execute()
+        StatementDuck.where(cash__isnull=bool(i % 2)).execute()
+
+    queries = [key for key in engine._statements.keys() if key[0] == "query"]
+    assert len(queries) == 3
+    assert len(StatementDuck.where(cash__isnull=True)) == 3
+    assert len(StatementDuck.where(cash__isnull=False)) == 2
+
+    engine._statement_cache_size = 1
+    assert StatementDuck.get(name="Duck1").cash == 1
+    assert len(engine._statements) == 1
@@ -0,0 +1,81 @@
+import tracemalloc
+
+import pytest
+
+from dbtogo.dbmodel import DBEngineFactory, DBModel
+from dbtogo.exceptions import NoBindError
+
+
+class StreamDuck(DBModel):
+    pk: int | None = None
+    name: str
+    friends: list[str] = []
+
+    @classmethod
+    def bind(cls, engine):
+        super().bind(engine, "pk", table="test_stream")
+
+
+def test_iter_all():
+    with pytest.raises(NoBindError):
+        StreamDuck.iter_all()
+
+    engine = DBEngineFactory.create_sqlite3_engine()
+    StreamDuck.bind(engine)
+
+    ducks = [StreamDuck(name=f"Duck{i}", friends=[str(i)]) for i in range(25)]
+    StreamDuck.save_many(ducks)
+    del ducks[10:]
+
+    streamed = StreamDuck.iter_all(chunk_size=4)
+    first = next(streamed)
+    assert first is ducks[0]
+
+    StreamDuck(name="Late").save()
+
+    rest = list(streamed)
+    assert len(rest) in (24, 25)
+    assert rest[:9] == ducks[1:]
+    assert all(a is b for a, b in zip(rest[:9], ducks[1:], strict=True))
+    assert rest[20].friends == ["21"]
+
+    rows = list(engine.select_iter("name", "test_stream", {"name": "Duck3"}))
+    assert rows == [("Duck3",)]
+
+
+class FlatDuck(DBModel):
+    pk: int | None = None
+    name: str
+    friends: list[str] = []
+
+    @classmethod
+    def bind(cls, engine):
+        super().bind(engine, "pk", table="test_stream_flat")
+
+
+def test_iter_all_memory():
+    engine = DBEngineFactory.create_sqlite3_engine()
+    FlatDuck.bind(engine)
+
+    rows = [{"name": f"Duck{i}", "friends": '["a", "b"]'} for i in range(10000)]
+    engine.insert_many("test_stream_flat", rows)
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    count = sum(1 for _ in FlatDuck.iter_all(chunk_size=500))
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    assert count == 10000
+    assert len(FlatDuck._cache) == 0
+    assert retained < 1024 * 1024
+
+    streamed = next(FlatDuck.iter_all())
+    streamed.name = "Renamed"
+    streamed.save()
+    assert FlatDuck.get(pk=1) is streamed
+    assert engine.select("name", "test_stream_flat", {"pk": 1}) == [("Renamed",)]
+
+    other = next(FlatDuck.iter_all())
+    other.delete()
+    assert FlatDuck.get(pk=1) is None
@@ -0,0 +1,95 @@
+import pytest
+
+from dbtogo.dbmodel import DBEngineFactory, DBModel
+from dbtogo.exceptions import NoBindError
+
+
+class AtomicDuck(DBModel):
+    pk: int | None = None
+    name: str
+
+    @classmethod
+    def bind(cls, engine):
+        super().bind(engine, "pk", unique=["name"], table="test_transaction")
+
+
+def test_transaction():
+    with pytest.raises(NoBindError):
+        AtomicDuck.atomic()
+
+    engine = DBEngineFactory.create_sqlite3_engine()
+    AtomicDuck.bind(engine)
+
+    with AtomicDuck.atomic():
+        kept = AtomicDuck(name="Kept")
+        kept.save()
+        assert engine.conn.in_transaction
+
+    assert not engine.conn.in_transaction
+    assert AtomicDuck.get(name="Kept") is kept
+
+    with pytest.raises(RuntimeError):
+        with AtomicDuck.atomic():
+            lost = AtomicDuck(name="Lost")
+            lost.save()
+            kept.delete()
+            raise RuntimeError()
+
+    assert AtomicDuck.get(name="Lost") is None
+    assert AtomicDuck.get(name="Kept") is kept
+    assert AtomicDuck._cache.get(lost.pk) is None
+    assert len(AtomicDuck.all()) == 1
+
+    with AtomicDuck.atomic():
+        outer = AtomicDuck(name="Outer")
+        outer.save()
+
+        with pytest.raises(RuntimeError):
+            with engine.transaction():
+                inner = AtomicDuck(name="Inner")
+                inner.save()
+                raise RuntimeError()
+
+        with engine.transaction():
+            nested = AtomicDuck(name="Nested")
+            nested.save()
+
+    assert AtomicDuck.get(name="Outer") is outer
+    assert AtomicDuck.get(name="Inner") is None
+    assert AtomicDuck._cache.get(inner.pk) is nested
+    assert AtomicDuck.get(name="Nested") is nested
+
+
+class UndoDuck(DBModel):
+    pk: int | None = None
+    name: str
+
+    @classmethod
+    def bind(cls, engine):
+        super().bind(engine, "pk", table="test_transaction_undo")
+
+
+def test_transaction_undo_keys():
+    engine = DBEngineFactory.create_sqlite3_engine()
+    UndoDuck.bind(engine)
+
+    ducks = [UndoDuck(name=f"Duck{i}") for i in range(5)]
+    UndoDuck.save_many(ducks)
+
+    with pytest.raises(RuntimeError):
+        with UndoDuck.atomic():
+            ducks[0].pk = 50
+            ducks[0].save()
+            ducks[1].delete()
+            assert len(engine._savepoints[-1]) < 10
+            raise RuntimeError()
+
+    assert ducks[0].pk == 50
+    assert UndoDuck._cache.get_hard(50) == 1
+    assert UndoDuck._cache.get(50) is ducks[0]
+    assert UndoDuck._cache.get(2) is ducks[1]
+    assert len(UndoDuck._cache) == 5
+
+    ducks[0].save()
+    assert engine.select("name", "test_transaction_undo", {"pk": 50}) == [("Duck0",)]
+    assert UndoDuck.get(pk=50) is ducks[0]
@@ -0,0 +1,65 @@
+from dbtogo.dbmodel import DBEngineFactory, DBModel
+
+
+class UpsertDuck(DBModel):
+    pk: int | None = None
+    name: str
+    cash: int | None = None
+
+    @classmethod
+    def bind(cls, engine):
+        super().bind(engine, "pk", unique=["name"], table="test_upsert")
+
+
+def test_upsert():
+    engine = DBEngineFactory.create_sqlite3_engine()
+    UpsertDuck.bind(engine)
+
+    outside = engine.insert("test_upsert", {"name": "Outside", "cash": 1})
+
+    duck = UpsertDuck(name="Outside", cash=5)
+    duck.upsert(conflict=("name",))
+    assert duck.pk == outside
+    assert UpsertDuck.get(name="Outside") is duck
+    assert engine.select("cash", "test_upsert", {"pk": outside}) == [(5,)]
+
+    explicit = UpsertDuck(pk=outside, name="Renamed")
+    explicit.upsert()
+    assert engine.select("name, cash", "test_upsert") == [("Renamed", None)]
+
+    statements: list[str] = []
+    engine.conn.set_trace_callback(statements.append)
+
+    ducks = [UpsertDuck(name=f"Duck{i}", cash=i) for i in range(10)]
+    UpsertDuck.upsert_many(ducks, conflict=("name",), batch_size=4)
+    engine.conn.set_trace_callback(None)
+
+    assert statements.count("COMMIT") == 3
+    assert not any(x.startswith("SELECT") for x in statements)
+    assert len({duck.pk for duck in ducks}) == 10
+
+    again = [UpsertDuck(name=f"Duck{i}", cash=i * 10) for i in range(10)]
+    UpsertDuck.upsert_many(again, conflict=("name",))
+
+    assert [duck.pk for duck in again] == [duck.pk for duck in ducks]
+    assert len(UpsertDuck.all()) == 11
+    assert UpsertDuck.get(name="Duck3") is ducks[3]
+    assert ducks[3].cash == 30
+
+
+def test_upsert_keeps_identity():
+    engine = DBEngineFactory.create_sqlite3_engine()
+    UpsertDuck.bind(engine)
+
+    live = UpsertDuck(name="Live", cash=1)
+    live.save()
+
+    copy = UpsertDuck(name="Live", cash=2)
+    copy.upsert(conflict=("name",))
+    assert copy.pk == live.pk
+    assert UpsertDuck.get(pk=live.pk) is live
+    assert live.cash == 2
+
+    live.cash = 3
+    live.save()
+    assert engine.select("cash", "test_upsert", {"pk": live.pk}) == [(3,)]
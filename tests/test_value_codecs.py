@@ -0,0 +1,203 @@
+import pickle
+
+import pytest
+from pydantic import BaseModel
+
+from dbtogo.dbmodel import DBEngineFactory, DBModel
+from dbtogo.serialization import (
+    JsonCodec,
+    ModelCodec,
+    OutOfBandPickleCodec,
+    PickleCodec,
+    RawBytesCodec,
+)
+
+
+class Pond(BaseModel):
+    name: str
+    depth: float = 1.0
+
+
+class CodecsDuck(DBModel):
+    pk: int | None = None
+    name: str
+    pond: Pond = Pond(name="Home")
+    friends: dict[str, int] = {}
+    photo: bytes | None = None
+    scan: bytes | None = None
+    tags: list[str] | None = None
+
+    @classmethod
+    def bind(cls, engine):
+        super().bind(
+            engine,
+            "pk",
+            table="test_value_codecs",
+            codecs={
+                "tags": OutOfBandPickleCodec(),
+                "scan": RawBytesCodec(legacy_pickle=True),
+            },
+        )
+
+
+def test_value_codecs():
+    engine = DBEngineFactory.create_sqlite3_engine()
+    CodecsDuck.bind(engine)
+
+    codecs = CodecsDuck._codec.codecs
+    assert isinstance(codecs["pond"], ModelCodec)
+    assert isinstance(codecs["friends"], JsonCodec)
+    assert isinstance(codecs["photo"], RawBytesCodec)
+    assert isinstance(codecs["tags"], OutOfBandPickleCodec)
+
+    duck = CodecsDuck(
+        name="Codecs",
+        pond=Pond(name="Lake", depth=3.5),
+        friends={"Donald": 2},
+        photo=b"\x89PNG",
+        tags=["yellow"],
+    )
+    duck.save()
+    CodecsDuck(name="Empty").save()
+
+    row = engine.select("pond, friends, photo", "test_value_codecs", {"pk": duck.pk})
+    assert row == [('{"name":"Lake","depth":3.5}', '{"Donald":2}', b"\x89PNG")]
+    assert engine.select("photo, tags", "test_value_codecs", {"name": "Empty"}) == [
+        (None, None)
+    ]
+
+    legacy = {
+        "name": "Legacy",
+        "pond": pickle.dumps(Pond(name="Old")),
+        "friends": pickle.dumps({"Daisy": 1}),
+        "photo": pickle.dumps(b"old"),
+        "scan": pickle.dumps(b"old"),
+        "tags": PickleCodec().encode(["old"]),
+    }
+    engine.insert("test_value_codecs", legacy)
+    engine.conn.execute("DELETE FROM _dbtogo_codecs")
+
+    CodecsDuck.bind(engine)
+    assert engine.select(
+        "pond, friends, photo", "test_value_codecs", {"name": "Legacy"}
+    ) == [('{"name":"Old","depth":1.0}', '{"Daisy":1}', b"old")]
+
+    assert engine.column_codecs("test_value_codecs") == {
+        "pond": "json",
+        "friends": "json",
+        "photo": "raw",
+        "scan": "raw",
+        "tags": "pickle",
+    }
+
+    statements: list[str] = []
+    engine.conn.set_trace_callback(statements.append)
+    CodecsDuck.bind(engine)
+    engine.conn.set_trace_callback(None)
+    assert not any(x.startswith(("UPDATE", "INSERT")) for x in statements)
+
+    loaded = CodecsDuck.get(name="Codecs")
+    assert loaded.pond == Pond(name="Lake", depth=3.5)
+    assert loaded.tags == ["yellow"]
+
+    old = CodecsDuck.get(name="Legacy")
+    assert old.pond == Pond(name="Old")
+    assert old.friends == {"Daisy": 1}
+    assert old.photo == b"old"
+    assert old.scan == b"old"
+    assert old.tags == ["old"]
+
+    empty = CodecsDuck.get(name="Empty")
+    assert empty.pond == Pond(name="Home")
+    assert empty.photo is None
+
+
+def test_out_of_band_pickle():
+    codec = OutOfBandPickleCodec()
+    value = {"frame": pickle.PickleBuffer(bytearray(b"x" * 1024)), "name": "Frame"}
+
+    data = codec.encode(value)
+    assert data.startswith(b"DBTOGO5")
+
+    decoded = codec.decode(data)
+    assert decoded["name"] == "Frame"
+    assert bytes(decoded["frame"]) == b"x" * 1024
+
+    assert codec.decode(codec.encode(["plain"])) == ["plain"]
+    assert codec.decode(pickle.dumps(["legacy"])) == ["legacy"]
+
+
+class Payload:
+    def __reduce__(self):
+        return (exec, ("raise RuntimeError('executed')",))
+
+
+def test_raw_bytes_legacy():
+    raw = RawBytesCodec()
+    legacy = RawBytesCodec(legacy_pickle=True)
+
+    looks_pickled = pickle.dumps(b"inner")
+    assert raw.decode(looks_pickled) == looks_pickled
+    assert raw.decode(pickle.dumps(None)) == pickle.dumps(None)
+
+    assert legacy.decode(looks_pickled) == b"inner"
+    assert legacy.decode(pickle.dumps(None)) is None
+    assert legacy.decode(b"\x89PNG") == b"\x89PNG"
+
+    malicious = pickle.dumps(Payload())
+    assert raw.decode(malicious) == malicious
+    assert legacy.decode(malicious) == malicious
+
+    with pytest.raises(pickle.UnpicklingError):
+        JsonCodec(list[str]).decode(malicious)
+
+    with pytest.raises(pickle.UnpicklingError):
+        ModelCodec(Pond).decode(malicious)
+
+    assert ModelCodec(Pond).decode(pickle.dumps(Pond(name="Old"))) == Pond(name="Old")
+    assert JsonCodec(set[int]).decode(pickle.dumps({1, 2})) == {1, 2}
+
+
+class DefaultsDuck(DBModel):
+    pk: int | None = None
+    name: str
+    tags: list[str] = []
+    pond: Pond = Pond(name="Home")
+    photo: bytes = b"\x00"
+
+    @classmethod
+    def bind(cls, engine):
+        super().bind(engine, "pk", table="test_value_codecs_defaults")
+
+
+class ChangedDefaultsDuck(DBModel):
+    pk: int | None = None
+    name: str
+    tags: list[str] = []
+    pond: Pond = Pond(name="Home")
+    photo: bytes = b"\x00"
+    cash: int = 0
+
+    @classmethod
+    def bind(cls, engine):
+        super().bind(
+            engine, "pk", table="test_value_codecs_defaults", indexes=[("name",)]
+        )
+
+
+def test_codec_defaults_migration():
+    engine = DBEngineFactory.create_sqlite3_engine()
+    DefaultsDuck.bind(engine)
+    DefaultsDuck(name="Before", tags=["a"]).save()
+
+    ChangedDefaultsDuck.bind(engine)
+    assert engine._get_indexes("test_value_codecs_defaults") == [("name",)]
+
+    before = ChangedDefaultsDuck.get(name="Before")
+    assert before.tags == ["a"]
+    assert before.pond == Pond(name="Home")
+    assert before.photo == b"\x00"
+
+    engine.insert("test_value_codecs_defaults", {"name": "Raw"})
+    raw = ChangedDefaultsDuck.get(name="Raw")
+    assert raw.tags == [] and raw.pond == Pond(name="Home") and raw.photo == b"\x00"
@@ -0,0 +1,70 @@
+import gc
+
+from dbtogo.dbmodel import DBEngineFactory, DBModel, WeakIdentityCache
+
+
+class WeakDuck(DBModel):
+    pk: int | None = None
+    name: str
+
+    @classmethod
+    def bind(cls, engine, cache_size=0):
+        super().bind(
+            engine,
+            "pk",
+            table="test_weak_identity",
+            weak_cache=True,
+            cache_size=cache_size,
+        )
+
+
+def test_weak_identity():
+    engine = DBEngineFactory.create_sqlite3_engine()
+    WeakDuck.bind(engine)
+    assert isinstance(WeakDuck._cache, WeakIdentityCache)
+
+    WeakDuck.save_many([WeakDuck(name=f"Duck{i}") for i in range(10)])
+    gc.collect()
+    assert len(WeakDuck._cache) == 0
+
+    duck = WeakDuck.get(name="Duck0")
+    assert WeakDuck.get(pk=1) is duck
+    assert WeakDuck.cache_stats()["hits"] == 1
+    assert WeakDuck.cache_stats()["misses"] == 1
+
+    duck.pk = 67
+    assert WeakDuck.get(name="Duck0") is duck
+    duck.save()
+    assert WeakDuck._cache.get(67) is duck
+
+    duck.pk = 68
+    del duck
+    gc.collect()
+    assert len(WeakDuck._cache) == 0
+    assert WeakDuck._cache._soft_keys == {}
+
+    assert WeakDuck.get(name="Duck0").pk == 67
+    assert len([duck.name for duck in WeakDuck.all(memoize=False)]) == 10
+    gc.collect()
+    assert len(WeakDuck._cache) == 0
+
+
+def test_weak_identity_lru():
+    engine = DBEngineFactory.create_sqlite3_engine()
+    WeakDuck.bind(engine, cache_size=3)
+
+    WeakDuck.save_many([WeakDuck(name=f"Duck{i}") for i in range(10)])
+    gc.collect()
+
+    stats = WeakDuck.cache_stats()
+    assert stats["size"] == 3
+    assert stats["strong"] == 3
+    assert stats["evictions"] == 7
+
+    assert [WeakDuck._cache.get(pk) is not None for pk in (8, 9, 10)] == [True] * 3
+
+    first = WeakDuck.get(pk=1)
+    del first
+    gc.collect()
+    assert WeakDuck._cache.get(8) is None
+    assert WeakDuck._cache.get(1) is not None